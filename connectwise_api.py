@@ -3,10 +3,18 @@ ConnectWise API helper functions for company and contact management
 """
 
 import os
+import asyncio
 import base64
+import random
 import re
-from typing import Optional, List, Dict, Tuple
+import functools
+from types import MappingProxyType
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Tuple, AsyncIterator
 import httpx
+import orjson
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,156 +24,411 @@ CW_PUBLIC_KEY = os.getenv("CW_PUBLIC_API_KEY")
 CW_PRIVATE_KEY = os.getenv("CW_PRIVATE_API_KEY")
 CW_COMPANY_ID = os.getenv("CW_COMPANY_ID")
 CW_BASE_URL = os.getenv("CW_BASE_URL")
+CW_MAX_CONNECTIONS = int(os.getenv("CW_MAX_CONNECTIONS", "50"))
+CW_PAGE_CONCURRENCY = int(os.getenv("CW_PAGE_CONCURRENCY", "10"))  # Max pages of a list fetched at once
+# Max requests in flight to ConnectWise; HTTP/2 multiplexes streams, so the pool size alone doesn't cap this
+CW_MAX_CONCURRENT_REQUESTS = int(os.getenv("CW_MAX_CONCURRENT_REQUESTS", "20"))
+
+
+# Credentials come from the environment and don't change at runtime, so build the headers once
+# (read-only so no caller can alter them for everyone else)
+_CW_HEADERS = MappingProxyType({
+    "Authorization": "Basic " + base64.b64encode(
+        f"{CW_COMPANY_ID}+{CW_PUBLIC_KEY}:{CW_PRIVATE_KEY}".encode()
+    ).decode(),
+    "ClientId": CW_CLIENT_ID,
+    "Content-Type": "application/json",
+    "Accept": "application/json"
+})
 
 
 def get_cw_headers():
-    """Generate ConnectWise API headers with authentication"""
-    auth_string = f"{CW_COMPANY_ID}+{CW_PUBLIC_KEY}:{CW_PRIVATE_KEY}"
-    auth_encoded = base64.b64encode(auth_string.encode()).decode()
-    
-    return {
-        "Authorization": f"Basic {auth_encoded}",
-        "ClientId": CW_CLIENT_ID,
-        "Content-Type": "application/json"
-    }
+    """Get ConnectWise API headers with authentication"""
+    return _CW_HEADERS
+
+
+# Responses worth retrying: ConnectWise throttling and transient gateway/server errors
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# 5xx retries are limited to methods that are safe to repeat (a retried POST could create duplicates)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryTransport(httpx.AsyncHTTPTransport):
+    """
+    Transport that retries throttled (429) and transient 5xx responses
+    with exponential backoff, honoring Retry-After when ConnectWise sends it.
+    At most max_concurrent requests are sent at once; the rest queue here rather than at ConnectWise.
+    """
+
+    def __init__(self, max_attempts: int = 4, backoff_initial: float = 0.2,
+                 backoff_max: float = 3.0, retry_after_max: float = 10.0,
+                 max_concurrent: int = CW_MAX_CONCURRENT_REQUESTS, **kwargs):
+        super().__init__(**kwargs)
+        self.max_attempts = max_attempts
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.max_concurrent = max_concurrent
+        self._in_flight = asyncio.Semaphore(max_concurrent)
+        self._queued = 0  # Requests waiting for a slot
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        """Seconds to wait before the next attempt"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return min(max(delay, 0.0), self.retry_after_max)
+
+        backoff = min(self.backoff_max, self.backoff_initial * (2 ** (attempt - 1)))
+        return backoff + random.uniform(0, self.backoff_initial)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 1
+
+        while True:
+            queued = self._in_flight.locked()
+            if queued:
+                # One line per burst: only the request that starts the queue reports it
+                if not self._queued:
+                    print(f"[THROTTLE] {self.max_concurrent} ConnectWise requests in flight, queueing the rest")
+                self._queued += 1
+            try:
+                await self._in_flight.acquire()
+            finally:
+                if queued:
+                    self._queued -= 1
+            # Held until the response headers arrive; backoff sleeps don't take a slot
+            try:
+                response = await super().handle_async_request(request)
+            finally:
+                self._in_flight.release()
+
+            retryable = response.status_code in RETRY_STATUS_CODES and (
+                response.status_code == 429 or request.method in IDEMPOTENT_METHODS
+            )
+            if not retryable or attempt >= self.max_attempts:
+                return response
+
+            delay = self._retry_delay(response, attempt)
+            await response.aclose()
+            print(f"[RETRY] {request.method} {request.url.path} -> {response.status_code}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def single_flight(func):
+    """
+    Concurrent calls with the same arguments share one in-flight call and its result
+    Only for read-only lookups; callers must not mutate what they get back.
+    """
+    running: Dict[tuple, asyncio.Task] = {}
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = (args, tuple(sorted(kwargs.items())))
+        task = running.get(key)
+        if task is None:
+            task = running[key] = asyncio.ensure_future(func(*args, **kwargs))
+            task.add_done_callback(lambda _: running.pop(key, None))
+        # Shielded so one caller going away doesn't cancel the call for the others
+        return await asyncio.shield(task)
+
+    return wrapper
+
+
+# Shared ConnectWise client so connections (and TLS sessions) are reused across calls
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared ConnectWise HTTP client, creating it on first use"""
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=CW_BASE_URL or "",
+            headers=_CW_HEADERS,
+            timeout=30.0,
+            # The transport owns the pool, so HTTP/2 and limits are configured on it
+            transport=RetryTransport(
+                retries=3,  # Connection-level retries (connect errors/timeouts)
+                http2=True,  # Concurrent requests share one connection as multiplexed streams
+                limits=httpx.Limits(
+                    max_connections=CW_MAX_CONNECTIONS,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0  # Keep idle connections around between screenpops
+                )
+            )
+        )
+
+    return _client
+
+
+async def close_client():
+    """Close the shared ConnectWise HTTP client (call on shutdown)"""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# Map phone types to ConnectWise communication type IDs (read-only)
+_PHONE_TYPE_ID = MappingProxyType({
+    "Cell": 2,
+    "Mobile": 2,
+    "Direct": 3,
+    "Phone": 4,
+    "Fax": 5
+})
+
+# Characters not allowed in a ConnectWise company identifier
+_NONALNUM = re.compile(r"[^a-zA-Z0-9]")
+
+
+# ASCII control characters, stripped from caller input before it goes into a conditions string
+_CONTROL_CHARS = str.maketrans("", "", "".join(map(chr, range(32))) + "\x7f")
+
+
+def _cw_string(value: str) -> str:
+    """Escape a value for use inside a quoted ConnectWise conditions string"""
+    return str(value).translate(_CONTROL_CHARS).replace("'", "''")
+
+
+def _cw_like(value: str) -> str:
+    """Escape a value for a ConnectWise 'like' pattern so %, _ and quotes match literally"""
+    value = str(value).translate(_CONTROL_CHARS)
+    value = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return value.replace("'", "''")
 
 
 def generate_company_identifier(company_name: str, max_length=30) -> str:
     """Generate a valid ConnectWise identifier from company name"""
-    identifier = re.sub(r"[^a-zA-Z0-9]", "", company_name)[:max_length]
+    identifier = _NONALNUM.sub("", company_name)[:max_length]
     return identifier or "TempCo"
 
 
+# Autocomplete results by (casefolded query, limit); typing on from a query that came back
+# short of the limit only narrows those results, so it is answered here without a request
+_COMPANY_SEARCHES = TTLCache(maxsize=256, ttl=60)
+
+
 async def search_companies(query: str, limit: int = 10) -> List[Dict]:
     """
     Search for companies by name in ConnectWise
     Returns list of matching companies
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        url = f"{CW_BASE_URL}/company/companies"
-        params = {
-            "conditions": f"name like '%{query}%'",
-            "pageSize": limit,
-            "orderBy": "name asc",
-            "fields": "id,name,identifier,city,state,phoneNumber,status"
-        }
-        
-        response = await client.get(
-            url,
-            headers=get_cw_headers(),
-            params=params
-        )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Error searching companies: {response.status_code} - {response.text}")
-            return []
+    needle = query.translate(_CONTROL_CHARS).casefold()
+    key = (needle, limit)
+    results = _COMPANY_SEARCHES.get(key)
+    if results is not None:
+        return results
+
+    for end in range(len(needle) - 1, 0, -1):
+        shorter = _COMPANY_SEARCHES.get((needle[:end], limit))
+        if shorter is not None and len(shorter) < limit:
+            results = _COMPANY_SEARCHES[key] = [c for c in shorter if needle in (c.get("name") or "").casefold()]
+            return results
+
+    return await _fetch_company_search(query, key)
+
+
+@single_flight
+async def _fetch_company_search(query: str, key: Tuple[str, int]) -> List[Dict]:
+    limit = key[1]
+    client = get_client()
+    params = {
+        "conditions": f"name like '%{_cw_like(query)}%'",
+        "pageSize": limit,
+        "orderBy": "name asc",
+        "fields": "id,name,identifier,city,state,phoneNumber,status"
+    }
+
+    response = await client.get("/company/companies", params=params)
+
+    if response.status_code == 200:
+        results = _COMPANY_SEARCHES[key] = orjson.loads(response.content)
+        return results
+    else:
+        print(f"Error searching companies: {response.status_code} - {response.text}")
+        return []
 
 
 async def get_company_by_id(company_id: int) -> Optional[Dict]:
     """Get full company details by ID"""
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        url = f"{CW_BASE_URL}/company/companies/{company_id}"
-        
-        response = await client.get(
-            url,
-            headers=get_cw_headers()
-        )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            return None
+    client = get_client()
+    response = await client.get(f"/company/companies/{company_id}")
+
+    if response.status_code == 200:
+        return orjson.loads(response.content)
+    else:
+        return None
+
+
+async def iter_pages(path: str, params: Optional[Dict] = None, page_size: int = 100,
+                     max_pages: Optional[int] = None) -> AsyncIterator[Tuple[int, List[Dict]]]:
+    """
+    Yield (page_number, results) for each page of a ConnectWise list endpoint as it arrives
+    Uses the endpoint's /count to work out how many pages there are, then
+    fetches them concurrently (bounded by CW_PAGE_CONCURRENCY), so pages after
+    the first come in completion order. Empty pages are skipped.
+    Raises httpx.HTTPStatusError if a page fails.
+    """
+    client = get_client()
+    params = dict(params or {})
+    params["pageSize"] = page_size
+    count_params = {"conditions": params["conditions"]} if "conditions" in params else None
+
+    async def fetch_page(page: int) -> Tuple[int, List[Dict]]:
+        response = await client.get(path, params={**params, "page": page})
+        response.raise_for_status()
+        return page, orjson.loads(response.content)
+
+    # Count and first page go out together; most lists fit in one page
+    count_resp, (_, first_page) = await asyncio.gather(
+        client.get(f"{path}/count", params=count_params),
+        fetch_page(1)
+    )
+    if first_page:
+        yield 1, first_page
+    if len(first_page) < page_size:
+        return
+
+    if count_resp.status_code == 200:
+        total_pages = -(-orjson.loads(count_resp.content).get("count", 0) // page_size)
+        if max_pages:
+            total_pages = min(total_pages, max_pages)
+
+        semaphore = asyncio.Semaphore(CW_PAGE_CONCURRENCY)
+
+        async def fetch_bounded(page: int) -> Tuple[int, List[Dict]]:
+            async with semaphore:
+                return await fetch_page(page)
+
+        tasks = [asyncio.ensure_future(fetch_bounded(p)) for p in range(2, total_pages + 1)]
+        try:
+            # Hand each page over as soon as it lands so the caller can process and drop it
+            for next_page in asyncio.as_completed(tasks):
+                page, results = await next_page
+                if results:
+                    yield page, results
+        finally:
+            # Caller stopped early or a page failed: don't leave fetches running
+            for task in tasks:
+                task.cancel()
+        return
+
+    # No count available: walk pages until a short one comes back
+    print(f"[WARNING] Count unavailable for {path} ({count_resp.status_code}), paging sequentially")
+    page = 2
+    while not max_pages or page <= max_pages:
+        _, results = await fetch_page(page)
+        if results:
+            yield page, results
+        if len(results) < page_size:
+            break
+        page += 1
+
+
+async def get_all_pages(path: str, params: Optional[Dict] = None, page_size: int = 100,
+                        max_pages: Optional[int] = None) -> List[List[Dict]]:
+    """
+    Fetch every page of a ConnectWise list endpoint (see iter_pages)
+    Returns the pages in order; raises httpx.HTTPStatusError if a page fails.
+    """
+    pages = sorted([page async for page in iter_pages(path, params, page_size, max_pages)])
+
+    # The list can shrink between the count and the fetches; nothing after a short page is real
+    for i, (_, results) in enumerate(pages):
+        if len(results) < page_size:
+            pages = pages[:i + 1]
+            break
+
+    return [results for _, results in pages]
+
+
+def _company_contacts_params(company_id: int) -> Dict:
+    return {
+        "conditions": f"company/id={company_id}",
+        "orderBy": "lastName asc",
+        "fields": "id,firstName,lastName,communicationItems"
+    }
 
 
 async def get_company_contacts(company_id: int) -> List[Dict]:
     """Get all contacts for a company"""
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        url = f"{CW_BASE_URL}/company/contacts"
-        params = {
-            "conditions": f"company/id={company_id}",
-            "pageSize": 100,
-            "orderBy": "lastName asc",
-            "fields": "id,firstName,lastName,communicationItems"
-        }
-        
-        response = await client.get(
-            url,
-            headers=get_cw_headers(),
-            params=params
-        )
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Error getting contacts: {response.status_code} - {response.text}")
-            return []
+    try:
+        pages = await get_all_pages("/company/contacts", _company_contacts_params(company_id))
+    except httpx.HTTPStatusError as e:
+        print(f"Error getting contacts: {e.response.status_code} - {e.response.text}")
+        return []
 
+    return [contact for page in pages for contact in page]
 
-async def add_phone_to_contact(contact_id: int, phone_number: str, phone_type: str = "Cell") -> bool:
+
+async def iter_company_contacts(company_id: int) -> AsyncIterator[List[Dict]]:
+    """
+    Yield a company's contacts a page at a time as pages arrive (see iter_pages)
+    The first page always comes first; later pages of very large companies may arrive out of order.
+    """
+    try:
+        async for _, contacts in iter_pages("/company/contacts", _company_contacts_params(company_id)):
+            yield contacts
+    except httpx.HTTPStatusError as e:
+        print(f"Error getting contacts: {e.response.status_code} - {e.response.text}")
+
+
+async def add_phone_to_contact(contact_id: int, phone_number: str, phone_type: str = "Cell") -> Optional[Dict]:
     """
     Add a phone number to an existing contact
     phone_type: "Cell", "Direct", "Mobile", "Fax", "Phone"
+    Returns the updated contact, or None on failure
     """
-    # Map phone types to ConnectWise communication type IDs
-    type_map = {
-        "Cell": 2,
-        "Mobile": 2,
-        "Direct": 3,
-        "Phone": 4,
-        "Fax": 5
-    }
-    
-    type_id = type_map.get(phone_type, 2)  # Default to Cell
-    
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # First, get current contact to get existing communication items
-        contact_url = f"{CW_BASE_URL}/company/contacts/{contact_id}"
-        contact_resp = await client.get(contact_url, headers=get_cw_headers())
-        
-        if contact_resp.status_code != 200:
-            print(f"Error getting contact: {contact_resp.text}")
-            return False
-        
-        contact = contact_resp.json()
-        comm_items = contact.get("communicationItems", [])
-        
-        # Check if phone already exists
-        for item in comm_items:
-            if item.get("value") == phone_number:
-                print(f"Phone {phone_number} already exists for contact")
-                return True
-        
-        # Add new communication item
-        new_item = {
-            "type": {"id": type_id},
-            "value": phone_number,
-            "communicationType": "Phone"
-        }
-        comm_items.append(new_item)
+    type_id = _PHONE_TYPE_ID.get(phone_type, 2)  # Default to Cell
 
-        # Update contact using JSON Patch format (RFC 6902)
-        patch_operations = [
-            {
-                "op": "replace",
-                "path": "communicationItems",
-                "value": comm_items
+    client = get_client()
+    contact_url = f"/company/contacts/{contact_id}"
+
+    # Check the contact's current numbers first; anything added since the last sync isn't in the phone cache
+    contact_resp = await client.get(contact_url, params={"fields": "id,firstName,lastName,company,communicationItems"})
+
+    if contact_resp.status_code != 200:
+        print(f"Error getting contact: {contact_resp.text}")
+        return None
+
+    contact = orjson.loads(contact_resp.content)
+    if any(item.get("value") == phone_number for item in contact.get("communicationItems") or ()):
+        print(f"Phone {phone_number} already exists for contact")
+        return contact
+
+    # Append to communicationItems with a JSON Patch (RFC 6902) "add", so concurrent adds can't overwrite each other
+    patch_operations = [
+        {
+            "op": "add",
+            "path": "communicationItems/-",
+            "value": {
+                "type": {"id": type_id},
+                "value": phone_number,
+                "communicationType": "Phone"
             }
-        ]
+        }
+    ]
 
-        update_resp = await client.patch(
-            contact_url,
-            headers=get_cw_headers(),
-            json=patch_operations
-        )
-        
-        if update_resp.status_code == 200:
-            print(f"Added phone {phone_number} to contact {contact_id}")
-            return True
-        else:
-            print(f"Error adding phone: {update_resp.text}")
-            return False
+    update_resp = await client.patch(contact_url, content=orjson.dumps(patch_operations))
+
+    if update_resp.status_code == 200:
+        print(f"Added phone {phone_number} to contact {contact_id}")
+        return orjson.loads(update_resp.content)
+    else:
+        print(f"Error adding phone: {update_resp.text}")
+        return None
 
 
 async def create_contact_with_phone(
@@ -180,15 +443,7 @@ async def create_contact_with_phone(
     Create a new contact with phone number
     Returns contact_id if successful
     """
-    type_map = {
-        "Cell": 2,
-        "Mobile": 2,
-        "Direct": 3,
-        "Phone": 4,
-        "Fax": 5
-    }
-    
-    phone_type_id = type_map.get(phone_type, 2)
+    phone_type_id = _PHONE_TYPE_ID.get(phone_type, 2)
     
     contact_data = {
         "firstName": first_name,
@@ -210,24 +465,18 @@ async def create_contact_with_phone(
             "value": email,
             "communicationType": "Email"
         })
-    
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        url = f"{CW_BASE_URL}/company/contacts"
-        
-        response = await client.post(
-            url,
-            headers=get_cw_headers(),
-            json=contact_data
-        )
-        
-        if response.status_code == 201:
-            created_contact = response.json()
-            contact_id = created_contact["id"]
-            print(f"Created contact with ID: {contact_id}")
-            return contact_id
-        else:
-            print(f"Error creating contact: {response.text}")
-            return None
+
+    client = get_client()
+    response = await client.post("/company/contacts", content=orjson.dumps(contact_data))
+
+    if response.status_code == 201:
+        created_contact = orjson.loads(response.content)
+        contact_id = created_contact["id"]
+        print(f"Created contact with ID: {contact_id}")
+        return contact_id
+    else:
+        print(f"Error creating contact: {response.text}")
+        return None
 
 
 async def create_company_and_contact(
@@ -267,87 +516,85 @@ async def create_company_and_contact(
         }
         
         print(f"[DEBUG] Company data: {company_data}")
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Create the company
-            company_resp = await client.post(
-                f"{CW_BASE_URL}/company/companies",
-                headers=get_cw_headers(),
-                json=company_data
-            )
-            
-            print(f"[DEBUG] Company creation response: {company_resp.status_code} - {company_resp.text}")
-            
-            if company_resp.status_code != 201:
-                raise Exception(f"Failed to create company: {company_resp.text}")
-            
-            created_company = company_resp.json()
-            company_id = created_company['id']
-            print(f"[DEBUG] Company created with ID: {company_id}")
-            
-            # Activate in finance
-            try:
-                await activate_company_finance(company_id)
-            except Exception as finance_error:
-                print(f"[WARNING] Failed to activate company finance: {str(finance_error)}")
-                # Continue - company still created
-            
-            # Create the contact
-            contact_data = {
-                "firstName": first_name,
-                "lastName": last_name,
-                "company": {"id": company_id},
-                "communicationItems": [
-                    {
-                        "type": {"id": 1},  # Email
-                        "value": email,
-                        "communicationType": "Email"
-                    },
-                    {
-                        "type": {"id": 2},  # Mobile/Cell
-                        "value": phone,
-                        "communicationType": "Phone"
-                    }
-                ]
-            }
-            
-            contact_resp = await client.post(
-                f"{CW_BASE_URL}/company/contacts",
-                headers=get_cw_headers(),
-                json=contact_data
+
+        client = get_client()
+
+        # Create the company
+        company_resp = await client.post("/company/companies", content=orjson.dumps(company_data))
+
+        print(f"[DEBUG] Company creation response: {company_resp.status_code} - {company_resp.text}")
+
+        if company_resp.status_code != 201:
+            raise Exception(f"Failed to create company: {company_resp.text}")
+
+        created_company = orjson.loads(company_resp.content)
+        company_id = created_company['id']
+        print(f"[DEBUG] Company created with ID: {company_id}")
+        _COMPANY_SEARCHES.clear()  # the new company must show up in the next search
+
+        # Create the contact
+        contact_data = {
+            "firstName": first_name,
+            "lastName": last_name,
+            "company": {"id": company_id},
+            "communicationItems": [
+                {
+                    "type": {"id": 1},  # Email
+                    "value": email,
+                    "communicationType": "Email"
+                },
+                {
+                    "type": {"id": 2},  # Mobile/Cell
+                    "value": phone,
+                    "communicationType": "Phone"
+                }
+            ]
+        }
+
+        # Finance activation and contact creation only depend on company_id - run them together
+        finance_result, contact_resp = await asyncio.gather(
+            activate_company_finance(company_id),
+            client.post("/company/contacts", content=orjson.dumps(contact_data)),
+            return_exceptions=True
+        )
+
+        if isinstance(finance_result, Exception):
+            print(f"[WARNING] Failed to activate company finance: {str(finance_result)}")
+            # Continue - company still created
+
+        if isinstance(contact_resp, Exception):
+            raise contact_resp
+
+        print(f"[DEBUG] Contact creation response: {contact_resp.status_code} - {contact_resp.text}")
+
+        if contact_resp.status_code != 201:
+            raise Exception(f"Failed to create contact: {contact_resp.text}")
+
+        created_contact = orjson.loads(contact_resp.content)
+        contact_id = created_contact['id']
+        print(f"[DEBUG] Contact created with ID: {contact_id}")
+
+        # Update company with default contact
+        try:
+            # Use JSON Patch format (RFC 6902)
+            patch_operations = [
+                {
+                    "op": "replace",
+                    "path": "defaultContact",
+                    "value": {"id": contact_id}
+                }
+            ]
+
+            update_resp = await client.patch(
+                f"/company/companies/{company_id}",
+                content=orjson.dumps(patch_operations)
             )
-            
-            print(f"[DEBUG] Contact creation response: {contact_resp.status_code} - {contact_resp.text}")
-            
-            if contact_resp.status_code != 201:
-                raise Exception(f"Failed to create contact: {contact_resp.text}")
-            
-            created_contact = contact_resp.json()
-            contact_id = created_contact['id']
-            print(f"[DEBUG] Contact created with ID: {contact_id}")
-            
-            # Update company with default contact
-            try:
-                # Use JSON Patch format (RFC 6902)
-                patch_operations = [
-                    {
-                        "op": "replace",
-                        "path": "defaultContact",
-                        "value": {"id": contact_id}
-                    }
-                ]
-
-                update_resp = await client.patch(
-                    f"{CW_BASE_URL}/company/companies/{company_id}",
-                    headers=get_cw_headers(),
-                    json=patch_operations
-                )
-                
-                print(f"[DEBUG] Company update response: {update_resp.status_code}")
-            except Exception as update_error:
-                print(f"[WARNING] Failed to update company with default contact: {str(update_error)}")
-            
-            return company_id, contact_id
+
+            print(f"[DEBUG] Company update response: {update_resp.status_code}")
+        except Exception as update_error:
+            print(f"[WARNING] Failed to update company with default contact: {str(update_error)}")
+
+        return company_id, contact_id
             
     except Exception as e:
         print(f"[ERROR] Exception in create_company_and_contact: {str(e)}")
@@ -360,35 +607,49 @@ async def get_company_tickets(company_id: int, status_filter: str = "open", limi
     status_filter: "open", "all", or specific status
     Returns list of tickets with id, summary, status, priority, etc.
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        url = f"{CW_BASE_URL}/service/tickets"
+    client = get_client()
+
+    # Build conditions based on status filter
+    if status_filter == "open":
+        conditions = f"company/id={company_id} AND closedFlag=false"
+    elif status_filter == "all":
+        conditions = f"company/id={company_id}"
+    else:
+        conditions = f"company/id={company_id} AND status/name='{_cw_string(status_filter)}'"
+
+    params = {
+        "conditions": conditions,
+        "pageSize": limit,
+        "orderBy": "id desc",
+        "fields": "id,summary,status,priority,board,contact,dateEntered,resources,closedFlag"
+    }
 
-        # Build conditions based on status filter
-        if status_filter == "open":
-            conditions = f"company/id={company_id} AND closedFlag=false"
-        elif status_filter == "all":
-            conditions = f"company/id={company_id}"
-        else:
-            conditions = f"company/id={company_id} AND status/name='{status_filter}'"
+    response = await client.get("/service/tickets", params=params)
 
-        params = {
-            "conditions": conditions,
-            "pageSize": limit,
-            "orderBy": "id desc",
-            "fields": "id,summary,status,priority,board,contact,dateEntered,resources,closedFlag"
-        }
+    if response.status_code == 200:
+        return orjson.loads(response.content)
+    else:
+        print(f"Error getting tickets: {response.status_code} - {response.text}")
+        return []
 
-        response = await client.get(
-            url,
-            headers=get_cw_headers(),
-            params=params
-        )
 
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Error getting tickets: {response.status_code} - {response.text}")
-            return []
+async def get_company_bundle(company_id: int) -> Dict:
+    """
+    Get company details, contacts and open tickets in one round trip
+    The three lookups are independent so they run concurrently
+    Returns dict with "company" (None if not found), "contacts" and "tickets"
+    """
+    company, contacts, tickets = await asyncio.gather(
+        get_company_by_id(company_id),
+        get_company_contacts(company_id),
+        get_company_tickets(company_id, status_filter="open", limit=25)
+    )
+
+    return {
+        "company": company,
+        "contacts": contacts,
+        "tickets": tickets
+    }
 
 
 async def create_ticket(
@@ -418,112 +679,107 @@ async def create_ticket(
 
         print(f"[DEBUG] Creating ticket with data: {ticket_data}")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            url = f"{CW_BASE_URL}/service/tickets"
+        client = get_client()
+        response = await client.post("/service/tickets", content=orjson.dumps(ticket_data))
 
-            response = await client.post(
-                url,
-                headers=get_cw_headers(),
-                json=ticket_data
-            )
-
-            if response.status_code == 201:
-                created_ticket = response.json()
-                ticket_id = created_ticket["id"]
-                print(f"✓ Created ticket #{ticket_id}: {summary}")
-                return ticket_id
-            else:
-                print(f"[TICKET ERROR] {response.status_code}")
-                try:
-                    error_json = response.json()
-                    print(f"[TICKET ERROR MESSAGE]: {error_json.get('message', 'No message')}")
-                    if "errors" in error_json:
-                        for err in error_json["errors"]:
-                            print(f"[TICKET ERROR DETAIL]: {err.get('message', '')}")
-                except Exception:
-                    print(f"[TICKET ERROR RAW TEXT]: {response.text}")
-                return None
+        if response.status_code == 201:
+            created_ticket = orjson.loads(response.content)
+            ticket_id = created_ticket["id"]
+            print(f"✓ Created ticket #{ticket_id}: {summary}")
+            return ticket_id
+        else:
+            print(f"[TICKET ERROR] {response.status_code}")
+            try:
+                error_json = orjson.loads(response.content)
+                print(f"[TICKET ERROR MESSAGE]: {error_json.get('message', 'No message')}")
+                if "errors" in error_json:
+                    for err in error_json["errors"]:
+                        print(f"[TICKET ERROR DETAIL]: {err.get('message', '')}")
+            except Exception:
+                print(f"[TICKET ERROR RAW TEXT]: {response.text}")
+            return None
 
     except Exception as e:
         print(f"[EXCEPTION] Error creating ticket: {str(e)}")
         return None
 
 
+# Companies known to have a finance record; finance records aren't removed in normal use,
+# so the TTL just bounds how long a stale entry could live
+_FINANCE_ACTIVATED = TTLCache(maxsize=4096, ttl=3600)
+
+
 async def activate_company_finance(company_id: int) -> bool:
     """
     Activate a company in the finance module
     This is required for billing/invoicing
     """
+    if company_id in _FINANCE_ACTIVATED:
+        return True
+
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # First check if finance record exists
-            check_url = f"{CW_BASE_URL}/finance/companyFinance"
-            check_params = {
-                "conditions": f"company/id={company_id}",
-                "pageSize": 1
-            }
+        client = get_client()
 
-            check_resp = await client.get(
-                check_url,
-                headers=get_cw_headers(),
-                params=check_params
-            )
+        # First check if finance record exists
+        check_params = {
+            "conditions": f"company/id={company_id}",
+            "pageSize": 1
+        }
 
-            if check_resp.status_code == 200 and check_resp.json():
-                print(f"Finance record already exists for company {company_id}")
-                return True
+        check_resp = await client.get("/finance/companyFinance", params=check_params)
 
-            # Create finance record
-            finance_data = {
-                "company": {"id": company_id},
-                "accountNumber": f"C{company_id:06d}",  # Format: C000250
-                "billingTerms": {"id": 2},  # Net 15 days (adjust as needed)
-                "taxCode": {"id": 1},  # Default tax code (adjust as needed)
-            }
+        if check_resp.status_code == 200 and orjson.loads(check_resp.content):
+            print(f"Finance record already exists for company {company_id}")
+            _FINANCE_ACTIVATED[company_id] = True
+            return True
 
-            create_url = f"{CW_BASE_URL}/finance/companyFinance"
-            create_resp = await client.post(
-                create_url,
-                headers=get_cw_headers(),
-                json=finance_data
-            )
+        # Create finance record
+        finance_data = {
+            "company": {"id": company_id},
+            "accountNumber": f"C{company_id:06d}",  # Format: C000250
+            "billingTerms": {"id": 2},  # Net 15 days (adjust as needed)
+            "taxCode": {"id": 1},  # Default tax code (adjust as needed)
+        }
+
+        create_resp = await client.post("/finance/companyFinance", content=orjson.dumps(finance_data))
 
-            if create_resp.status_code == 201:
-                print(f"Activated company {company_id} in finance module")
-                return True
-            else:
-                print(f"Error activating finance: {create_resp.status_code} - {create_resp.text}")
-                return False
+        if create_resp.status_code == 201:
+            print(f"Activated company {company_id} in finance module")
+            _FINANCE_ACTIVATED[company_id] = True
+            return True
+        else:
+            print(f"Error activating finance: {create_resp.status_code} - {create_resp.text}")
+            return False
 
     except Exception as e:
         print(f"Error activating company finance: {str(e)}")
         return False
 
 
+@single_flight
 async def get_all_members() -> List[Dict]:
     """
     Get all members (technicians/resources) from ConnectWise
     Returns list of members with id, identifier, firstName, lastName
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        url = f"{CW_BASE_URL}/system/members"
-        params = {
-            "pageSize": 500,
-            "orderBy": "firstName asc",
-            "fields": "id,identifier,firstName,lastName,officeEmail,inactiveFlag"
-        }
+    client = get_client()
+    params = {
+        "pageSize": 500,
+        "orderBy": "firstName asc",
+        "fields": "id,identifier,firstName,lastName,officeEmail,inactiveFlag"
+    }
 
-        response = await client.get(
-            url,
-            headers=get_cw_headers(),
-            params=params
-        )
+    response = await client.get("/system/members", params=params)
 
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Error getting members: {response.status_code} - {response.text}")
-            return []
+    if response.status_code == 200:
+        return orjson.loads(response.content)
+    else:
+        print(f"Error getting members: {response.status_code} - {response.text}")
+        return []
+
+
+# Members found by (first_name, last_name); only hits are kept, so a newly added member shows up at once
+_MEMBERS_BY_NAME = TTLCache(maxsize=512, ttl=300)
 
 
 async def get_member_by_name(first_name: str, last_name: str) -> Optional[Dict]:
@@ -531,30 +787,32 @@ async def get_member_by_name(first_name: str, last_name: str) -> Optional[Dict]:
     Get a member by their name
     Returns member dict or None if not found
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        url = f"{CW_BASE_URL}/system/members"
-        params = {
-            "conditions": f"firstName='{first_name}' AND lastName='{last_name}'",
-            "pageSize": 1,
-            "fields": "id,identifier,firstName,lastName,officeEmail,inactiveFlag"
-        }
+    key = (first_name, last_name)
+    member = _MEMBERS_BY_NAME.get(key)
+    if member is not None:
+        return member
+
+    client = get_client()
+    params = {
+        "conditions": f"firstName='{_cw_string(first_name)}' AND lastName='{_cw_string(last_name)}'",
+        "pageSize": 1,
+        "fields": "id,identifier,firstName,lastName,officeEmail,inactiveFlag"
+    }
 
-        response = await client.get(
-            url,
-            headers=get_cw_headers(),
-            params=params
-        )
+    response = await client.get("/system/members", params=params)
 
-        if response.status_code == 200:
-            members = response.json()
-            if members:
-                return members[0]
-        else:
-            print(f"Error getting member: {response.status_code} - {response.text}")
+    if response.status_code == 200:
+        members = orjson.loads(response.content)
+        if members:
+            _MEMBERS_BY_NAME[key] = members[0]
+            return members[0]
+    else:
+        print(f"Error getting member: {response.status_code} - {response.text}")
 
-        return None
+    return None
 
 
+@single_flight
 async def get_member_tickets(member_identifier: str, status_filter: str = "open", limit: int = 50) -> List[Dict]:
     """
     Get tickets assigned to a specific member/resource
@@ -562,32 +820,27 @@ async def get_member_tickets(member_identifier: str, status_filter: str = "open"
     status_filter: "open", "all", or specific status
     Returns list of tickets with id, summary, status, priority, company, etc.
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        url = f"{CW_BASE_URL}/service/tickets"
-
-        # Build conditions based on status filter
-        if status_filter == "open":
-            conditions = f"resources='{member_identifier}' AND closedFlag=false"
-        elif status_filter == "all":
-            conditions = f"resources='{member_identifier}'"
-        else:
-            conditions = f"resources='{member_identifier}' AND status/name='{status_filter}'"
-
-        params = {
-            "conditions": conditions,
-            "pageSize": limit,
-            "orderBy": "id desc",
-            "fields": "id,summary,status,priority,board,company,contact,dateEntered,resources,closedFlag"
-        }
+    client = get_client()
+
+    # Build conditions based on status filter
+    if status_filter == "open":
+        conditions = f"resources='{_cw_string(member_identifier)}' AND closedFlag=false"
+    elif status_filter == "all":
+        conditions = f"resources='{_cw_string(member_identifier)}'"
+    else:
+        conditions = f"resources='{_cw_string(member_identifier)}' AND status/name='{_cw_string(status_filter)}'"
+
+    params = {
+        "conditions": conditions,
+        "pageSize": limit,
+        "orderBy": "id desc",
+        "fields": "id,summary,status,priority,board,company,contact,dateEntered,resources,closedFlag,_info/lastUpdated"
+    }
 
-        response = await client.get(
-            url,
-            headers=get_cw_headers(),
-            params=params
-        )
+    response = await client.get("/service/tickets", params=params)
 
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Error getting member tickets: {response.status_code} - {response.text}")
-            return []
+    if response.status_code == 200:
+        return orjson.loads(response.content)
+    else:
+        print(f"Error getting member tickets: {response.status_code} - {response.text}")
+        return []
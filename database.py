@@ -2,164 +2,407 @@
 Database models and cache management for phone number lookups
 """
 
+import os
+import asyncio
+import functools
+import queue
 import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, Mapping, FrozenSet
 import json
 
+from cachetools import TTLCache
+
+
+# Rows pulled per fetchmany() when scanning a whole table
+SCAN_BATCH_SIZE = 1000
+
+# Max queued single-row writes committed together by the writer thread
+WRITE_BATCH_MAX = 500
+
+# One cached phone match, fields in the order lookup() selects them
+CacheHit = namedtuple("CacheHit", [
+    "phone_number",
+    "normalized_phone",
+    "company_id",
+    "company_name",
+    "contact_id",
+    "contact_name",
+    "contact_type",
+    "last_updated"
+])
+
+# An extension resolved to its technician, plus the name to look up in ConnectWise
+ResolvedExtension = namedtuple("ResolvedExtension", [
+    "first_name",
+    "last_name",
+    "cw_first_name",
+    "cw_last_name",
+    "is_override",
+    "source"
+])
+
+# Insert a phone cache row, or refresh it if the phone/company/contact already exists
+UPSERT_PHONE_SQL = """
+    INSERT INTO phone_cache (
+        phone_number, normalized_phone, company_id, company_name,
+        contact_id, contact_name, contact_type
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (normalized_phone, company_id, IFNULL(contact_id, -1)) DO UPDATE SET
+        phone_number = excluded.phone_number,
+        company_name = excluded.company_name,
+        contact_name = excluded.contact_name,
+        contact_type = excluded.contact_type,
+        last_updated = CURRENT_TIMESTAMP
+"""
+
+# All cached matches for a normalized phone, newest first (served by idx_phone_lookup)
+LOOKUP_PHONE_SQL = """
+    SELECT
+        phone_number,
+        normalized_phone,
+        company_id,
+        company_name,
+        contact_id,
+        contact_name,
+        contact_type,
+        last_updated
+    FROM phone_cache
+    WHERE normalized_phone = ?
+    ORDER BY last_updated DESC
+"""
+
+# Prepared statements kept per connection, keyed by SQL text (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+
+def connect(db_path: str, read_only: bool = False) -> sqlite3.Connection:
+    """
+    Open a SQLite connection tuned for this app
+    Used by both PhoneCache and ExtensionAssignments, which share one database file.
+    read_only connections can't write, and expect the file to exist already in WAL mode.
+    """
+    # Autocommit; check_same_thread=False because callers share it across threads behind a lock
+    if read_only:
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, isolation_level=None,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+    else:
+        conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        # WAL lets lookups read while a sync is writing (persists in the file)
+        conn.execute("PRAGMA journal_mode=WAL")
+
+    # Per-connection tuning
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")  # Wait for the other connection's write instead of failing
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+
+    return conn
+
+
+class ReadPool:
+    """Fixed set of read-only connections, each used by one caller at a time"""
+
+    def __init__(self, db_path: str, size: Optional[int] = None):
+        self._size = size or os.cpu_count() or 4
+        self._pool = queue.LifoQueue()  # LIFO keeps the most recently used (warmest) connection in play
+        for _ in range(self._size):
+            self._pool.put(connect(db_path, read_only=True))
+
+    @contextmanager
+    def connection(self):
+        """Borrow a read connection for the duration of the with-block"""
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        """Close every pooled connection (waits for borrowed ones to come back)"""
+        for _ in range(self._size):
+            self._pool.get().close()
+
 
 class PhoneCache:
     """Manages phone number caching in SQLite"""
-    
-    def __init__(self, db_path: str = "data/phone_cache.db"):
+
+    def __init__(self, db_path: str = "data/phone_cache.db",
+                 lookup_cache_size: int = 4096, lookup_cache_ttl: int = 300,
+                 stats_ttl: float = 5.0):
         self.db_path = db_path
+        # Single writer connection for the process lifetime, shared across threads behind a lock
+        self._conn = connect(db_path)
+        self._lock = threading.Lock()
+        # Recent lookups by normalized phone, so repeat callers skip SQLite entirely.
+        # The generation counter lets a lookup that raced a write avoid caching what it read.
+        self._lookup_cache = TTLCache(maxsize=lookup_cache_size, ttl=lookup_cache_ttl)
+        self._lookup_cache_lock = threading.Lock()
+        self._write_generation = 0
+        # get_cache_stats() result, reused for stats_ttl seconds or until the next write
+        self._stats_cache = None
+        self._stats_expires = 0.0
+        self._stats_ttl = stats_ttl
         self.init_db()
-    
+
+        # Reads go through their own connections so they run alongside the writer (WAL)
+        self._readers = ReadPool(db_path)
+
+        # Single-row writes are queued and committed in batches by a writer thread,
+        # so request handlers don't wait on the commit
+        self._write_queue = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop, name="phone-cache-writer", daemon=True)
+        self._writer.start()
+
+    def close(self):
+        """Flush pending writes and close the database connection"""
+        self._write_queue.put(None)
+        self._writer.join()
+        self._readers.close()
+        with self._lock:
+            self._conn.close()
+
+    def _writer_loop(self):
+        """Commit queued rows in batches until a None sentinel arrives"""
+        while True:
+            row = self._write_queue.get()
+            batch = [] if row is None else [row]
+            stop = row is None
+
+            # Take whatever else is already waiting, up to the batch limit
+            while not stop and len(batch) < WRITE_BATCH_MAX:
+                try:
+                    row = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if row is None:
+                    stop = True
+                else:
+                    batch.append(row)
+
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._write_queue.task_done()
+
+            if stop:
+                return
+
+    def _write_batch(self, batch: List[tuple]):
+        """Commit a batch; if it fails, retry row by row so one bad row only loses itself"""
+        try:
+            self.add_or_update_many(batch)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                print(f"❌ Phone cache write failed: {str(e)}")
+                return
+            print(f"⚠️  Phone cache batch failed ({len(batch)} rows), retrying rows one at a time: {str(e)}")
+
+        for row in batch:
+            try:
+                self.add_or_update_many([row])
+            except Exception as e:
+                print(f"❌ Phone cache write failed for {row[0]}: {str(e)}")
+
+    def flush(self):
+        """Block until all queued writes are committed"""
+        self._write_queue.join()
+
     def init_db(self):
         """Initialize database schema"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create phone_cache table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS phone_cache (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                phone_number TEXT NOT NULL,
-                normalized_phone TEXT NOT NULL,
-                company_id INTEGER NOT NULL,
-                company_name TEXT NOT NULL,
-                contact_id INTEGER,
-                contact_name TEXT,
-                contact_type TEXT,
-                last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Create index on normalized phone for fast lookups
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_normalized_phone 
-            ON phone_cache(normalized_phone)
-        """)
-        
-        # Create sync_log table to track sync operations
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sync_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                sync_type TEXT NOT NULL,
-                records_processed INTEGER DEFAULT 0,
-                records_added INTEGER DEFAULT 0,
-                records_updated INTEGER DEFAULT 0,
-                started_at TIMESTAMP NOT NULL,
-                completed_at TIMESTAMP,
-                status TEXT NOT NULL,
-                error_message TEXT
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
-    
-    def lookup(self, normalized_phone: str) -> List[Dict]:
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            # Create phone_cache table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS phone_cache (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    phone_number TEXT NOT NULL,
+                    normalized_phone TEXT NOT NULL,
+                    company_id INTEGER NOT NULL,
+                    company_name TEXT NOT NULL,
+                    contact_id INTEGER,
+                    contact_name TEXT,
+                    contact_type TEXT,
+                    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # One row per phone/company/contact so writes can upsert instead of SELECT-then-write.
+            # normalized_phone leads the index, so it also serves lookups by phone.
+            cursor.execute("""
+                SELECT 1 FROM sqlite_master
+                WHERE type = 'index' AND name = 'idx_phone_company_contact'
+            """)
+            if not cursor.fetchone():
+                # Drop duplicates left over from before the unique index existed, keeping the newest
+                cursor.execute("""
+                    DELETE FROM phone_cache
+                    WHERE id NOT IN (
+                        SELECT MAX(id) FROM phone_cache
+                        GROUP BY normalized_phone, company_id, IFNULL(contact_id, -1)
+                    )
+                """)
+                cursor.execute("""
+                    CREATE UNIQUE INDEX idx_phone_company_contact
+                    ON phone_cache(normalized_phone, company_id, IFNULL(contact_id, -1))
+                """)
+
+            # The composite index makes the old single-column phone index redundant
+            cursor.execute("DROP INDEX IF EXISTS idx_normalized_phone")
+
+            # Covering index for lookup(): already in last_updated order and holding every
+            # selected column, so a screenpop is one index range read with no sort or row fetch
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_phone_lookup
+                ON phone_cache(
+                    normalized_phone, last_updated DESC,
+                    phone_number, company_id, company_name,
+                    contact_id, contact_name, contact_type
+                )
+            """)
+
+            # Create sync_log table to track sync operations
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sync_log (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    sync_type TEXT NOT NULL,
+                    records_processed INTEGER DEFAULT 0,
+                    records_added INTEGER DEFAULT 0,
+                    records_updated INTEGER DEFAULT 0,
+                    started_at TIMESTAMP NOT NULL,
+                    completed_at TIMESTAMP,
+                    status TEXT NOT NULL,
+                    error_message TEXT
+                )
+            """)
+
+    def lookup(self, normalized_phone: str) -> List[CacheHit]:
         """
         Look up cached records for a phone number
         Returns list of matching records (can be multiple)
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                phone_number,
-                normalized_phone,
-                company_id,
-                company_name,
-                contact_id,
-                contact_name,
-                contact_type,
-                last_updated
-            FROM phone_cache
-            WHERE normalized_phone = ?
-            ORDER BY last_updated DESC
-        """, (normalized_phone,))
-        
-        results = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        
-        return results
-    
-    def add_or_update(self, phone_number: str, normalized_phone: str, 
+        # Make sure a write queued just before this lookup is visible
+        if self._write_queue.unfinished_tasks:
+            self.flush()
+
+        with self._lookup_cache_lock:
+            cached = self._lookup_cache.get(normalized_phone)
+            generation = self._write_generation
+        if cached is not None:
+            return list(cached)
+
+        with self._readers.connection() as conn:
+            cursor = conn.execute(LOOKUP_PHONE_SQL, (normalized_phone,))
+
+            results = tuple(map(CacheHit._make, cursor.fetchall()))
+
+        with self._lookup_cache_lock:
+            # Only cache if no write landed while we were reading
+            if generation == self._write_generation:
+                self._lookup_cache[normalized_phone] = results
+
+        return list(results)
+
+    def _invalidate(self, normalized_phones):
+        """Drop memoized lookups for phones that were just written"""
+        self._stats_expires = 0.0
+        with self._lookup_cache_lock:
+            self._write_generation += 1
+            for normalized_phone in normalized_phones:
+                self._lookup_cache.pop(normalized_phone, None)
+
+    def add_or_update(self, phone_number: str, normalized_phone: str,
                       company_id: int, company_name: str,
                       contact_id: Optional[int] = None,
                       contact_name: Optional[str] = None,
                       contact_type: Optional[str] = None):
-        """Add or update a phone cache entry"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if this exact record exists
-        cursor.execute("""
-            SELECT id FROM phone_cache
-            WHERE normalized_phone = ? AND company_id = ? AND contact_id IS ?
-        """, (normalized_phone, company_id, contact_id))
-        
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing record
-            cursor.execute("""
-                UPDATE phone_cache
-                SET phone_number = ?,
-                    company_name = ?,
-                    contact_name = ?,
-                    contact_type = ?,
-                    last_updated = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (phone_number, company_name, contact_name, contact_type, existing[0]))
-        else:
-            # Insert new record
-            cursor.execute("""
-                INSERT INTO phone_cache (
-                    phone_number, normalized_phone, company_id, company_name,
-                    contact_id, contact_name, contact_type
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (phone_number, normalized_phone, company_id, company_name,
-                  contact_id, contact_name, contact_type))
-        
-        conn.commit()
-        conn.close()
-    
+        """Queue a phone cache entry to be added or updated (returns without waiting for the commit)"""
+        # Checked here, since a failed row is only noticed later on the writer thread. Callers have
+        # already saved the contact in ConnectWise, so an unusable row (e.g. a caller ID with no
+        # digits) is skipped rather than failing their request.
+        if not phone_number or not normalized_phone or company_id is None or company_name is None:
+            print(f"⚠️  Not caching {phone_number!r}: needs a phone with digits, a company id and a company name")
+            return
+        self._write_queue.put_nowait((
+            phone_number, normalized_phone, company_id, company_name,
+            contact_id, contact_name, contact_type
+        ))
+
+    def add_or_update_many(self, rows: List[tuple]) -> Tuple[int, int]:
+        """
+        Add or update many phone cache entries in one transaction
+        Each row is (phone_number, normalized_phone, company_id, company_name,
+        contact_id, contact_name, contact_type)
+        Returns (records_added, records_updated)
+        """
+        if not rows:
+            return 0, 0
+
+        with self._lock:
+            cursor = self._conn.cursor()
+            # Take the write lock up front so only our rows land in the new id range
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # AUTOINCREMENT ids only grow and updates keep their id, so inserted rows
+                # are exactly those above the current max (a rowid range probe, not a scan)
+                cursor.execute("SELECT IFNULL(MAX(id), 0) FROM phone_cache")
+                max_id_before = cursor.fetchone()[0]
+                cursor.executemany(UPSERT_PHONE_SQL, rows)
+                cursor.execute("SELECT COUNT(*) FROM phone_cache WHERE id > ?", (max_id_before,))
+                records_added = cursor.fetchone()[0]
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            cursor.execute("COMMIT")
+
+        self._invalidate(row[1] for row in rows)
+
+        return records_added, len(rows) - records_added
+
     def get_cache_stats(self) -> Dict:
-        """Get statistics about the cache"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Total cached phone numbers
-        cursor.execute("SELECT COUNT(DISTINCT normalized_phone) FROM phone_cache")
-        unique_phones = cursor.fetchone()[0]
-        
-        # Total records (including duplicates for multiple matches)
-        cursor.execute("SELECT COUNT(*) FROM phone_cache")
-        total_records = cursor.fetchone()[0]
-        
-        # Oldest and newest records
-        cursor.execute("SELECT MIN(last_updated), MAX(last_updated) FROM phone_cache")
-        oldest, newest = cursor.fetchone()
-        
-        # Last sync info
-        cursor.execute("""
-            SELECT sync_type, completed_at, records_added, records_updated, status
-            FROM sync_log
-            ORDER BY id DESC
-            LIMIT 1
-        """)
-        last_sync = cursor.fetchone()
-        
-        conn.close()
-        
-        return {
+        """Get statistics about the cache (cached for a few seconds; writes refresh it)"""
+        if self._stats_cache is not None and time.monotonic() < self._stats_expires:
+            return self._stats_cache
+
+        with self._readers.connection() as conn:
+            cursor = conn.cursor()
+
+            # Total cached phone numbers
+            cursor.execute("SELECT COUNT(DISTINCT normalized_phone) FROM phone_cache")
+            unique_phones = cursor.fetchone()[0]
+
+            # Total records (including duplicates for multiple matches)
+            cursor.execute("SELECT COUNT(*) FROM phone_cache")
+            total_records = cursor.fetchone()[0]
+
+            # Oldest and newest records
+            cursor.execute("SELECT MIN(last_updated), MAX(last_updated) FROM phone_cache")
+            oldest, newest = cursor.fetchone()
+
+            # Last sync info
+            cursor.execute("""
+                SELECT sync_type, completed_at, records_added, records_updated, status
+                FROM sync_log
+                ORDER BY id DESC
+                LIMIT 1
+            """)
+            last_sync = cursor.fetchone()
+
+        self._stats_cache = {
             "unique_phones": unique_phones,
             "total_records": total_records,
             "oldest_record": oldest,
@@ -172,166 +415,301 @@ class PhoneCache:
                 "status": last_sync[4] if last_sync else None
             } if last_sync else None
         }
-    
+        self._stats_expires = time.monotonic() + self._stats_ttl
+
+        return self._stats_cache
+
     def start_sync(self, sync_type: str = "auto") -> int:
         """Start a sync operation and return sync_id"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO sync_log (sync_type, started_at, status)
-            VALUES (?, datetime('now'), 'running')
-        """, (sync_type,))
-        
-        sync_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            cursor.execute("""
+                INSERT INTO sync_log (sync_type, started_at, status)
+                VALUES (?, datetime('now'), 'running')
+            """, (sync_type,))
+
+            sync_id = cursor.lastrowid
+
+        self._stats_expires = 0.0
+
         return sync_id
-    
-    def complete_sync(self, sync_id: int, records_processed: int, 
+
+    def complete_sync(self, sync_id: int, records_processed: int,
                      records_added: int, records_updated: int,
                      status: str = "completed", error_message: str = None):
         """Complete a sync operation"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            UPDATE sync_log
-            SET records_processed = ?,
-                records_added = ?,
-                records_updated = ?,
-                completed_at = datetime('now'),
-                status = ?,
-                error_message = ?
-            WHERE id = ?
-        """, (records_processed, records_added, records_updated, 
-              status, error_message, sync_id))
-        
-        conn.commit()
-        conn.close()
-    
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            cursor.execute("""
+                UPDATE sync_log
+                SET records_processed = ?,
+                    records_added = ?,
+                    records_updated = ?,
+                    completed_at = datetime('now'),
+                    status = ?,
+                    error_message = ?
+                WHERE id = ?
+            """, (records_processed, records_added, records_updated,
+                  status, error_message, sync_id))
+
+        self._stats_expires = 0.0
+
     def clear_cache(self):
         """Clear all cached data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM phone_cache")
-        conn.commit()
-        conn.close()
-    
+        self.flush()
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("DELETE FROM phone_cache")
+
+        self._stats_expires = 0.0
+        with self._lookup_cache_lock:
+            self._write_generation += 1
+            self._lookup_cache.clear()
+
     def get_stale_cache_age(self) -> Optional[int]:
         """Get age of oldest cache entry in hours"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT MIN(last_updated) FROM phone_cache
-        """)
-        
-        oldest = cursor.fetchone()[0]
-        conn.close()
-        
+        with self._readers.connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT MIN(last_updated) FROM phone_cache
+            """)
+
+            oldest = cursor.fetchone()[0]
+
         if not oldest:
             return None
-        
+
         oldest_dt = datetime.fromisoformat(oldest)
         age_hours = (datetime.now() - oldest_dt).total_seconds() / 3600
-        
+
         return int(age_hours)
 
 
+class AsyncPhoneCache:
+    """Awaitable PhoneCache for the event loop
+
+    SQLite calls block, so reads run in parallel on a thread pool (WAL lets them run
+    alongside a write) and writes run one at a time on a dedicated writer thread.
+    Connections stay open for the process lifetime in the wrapped PhoneCache.
+    """
+
+    def __init__(self, db_path: str = "data/phone_cache.db", **kwargs):
+        self.sync = PhoneCache(db_path, **kwargs)
+        self._read_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="sqlite-reader")
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+
+    async def run_read(self, fn, *args, **kwargs):
+        """Run a blocking database read on the reader threads"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._read_executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    async def run_write(self, fn, *args, **kwargs):
+        """Run a blocking database write on the writer thread"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._write_executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    def close(self):
+        """Finish in-flight calls, then flush and close the underlying cache"""
+        self._read_executor.shutdown()
+        self._write_executor.shutdown()
+        self.sync.close()
+
+    async def lookup(self, normalized_phone: str) -> List[CacheHit]:
+        return await self.run_read(self.sync.lookup, normalized_phone)
+
+    async def get_cache_stats(self) -> Dict:
+        return await self.run_read(self.sync.get_cache_stats)
+
+    async def get_stale_cache_age(self) -> Optional[int]:
+        return await self.run_read(self.sync.get_stale_cache_age)
+
+    def add_or_update(self, *args, **kwargs):
+        """Queue a single row for the background writer (never blocks)"""
+        self.sync.add_or_update(*args, **kwargs)
+
+    async def add_or_update_many(self, rows: List[tuple]) -> Tuple[int, int]:
+        return await self.run_write(self.sync.add_or_update_many, rows)
+
+    async def start_sync(self, sync_type: str = "auto") -> int:
+        return await self.run_write(self.sync.start_sync, sync_type)
+
+    async def complete_sync(self, *args, **kwargs):
+        return await self.run_write(self.sync.complete_sync, *args, **kwargs)
+
+    async def clear_cache(self):
+        return await self.run_write(self.sync.clear_cache)
+
+
 class ExtensionAssignments:
     """Manages extension-to-technician assignments in SQLite"""
 
     def __init__(self, db_path: str = "data/phone_cache.db"):
         self.db_path = db_path
+        # One connection for the process lifetime, shared across threads behind a lock
+        self._conn = connect(db_path)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        # In-memory copy of extension -> (first_name, last_name), swapped whole after each change;
+        # version goes up with every swap so readers know to rebuild anything derived from it
+        self._names: Dict[str, Tuple[str, str]] = {}
+        self.version = 0
         self.init_db()
+        self._reload_names()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
 
     def init_db(self):
         """Initialize extension assignments table"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Create extension_assignments table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS extension_assignments (
-                extension TEXT PRIMARY KEY,
-                first_name TEXT NOT NULL,
-                last_name TEXT NOT NULL,
-                member_identifier TEXT,
-                assigned_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
-        conn.commit()
-        conn.close()
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            # Create extension_assignments table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS extension_assignments (
+                    extension TEXT PRIMARY KEY,
+                    first_name TEXT NOT NULL,
+                    last_name TEXT NOT NULL,
+                    member_identifier TEXT,
+                    assigned_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
 
     def assign_extension(self, extension: str, first_name: str, last_name: str, member_identifier: str = None):
         """Assign an extension to a technician"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            # Update in place on reassignment so the original assigned_date is kept
+            cursor.execute("""
+                INSERT INTO extension_assignments
+                (extension, first_name, last_name, member_identifier, updated_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT (extension) DO UPDATE SET
+                    first_name = excluded.first_name,
+                    last_name = excluded.last_name,
+                    member_identifier = excluded.member_identifier,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (extension, first_name, last_name, member_identifier))
 
-        cursor.execute("""
-            INSERT OR REPLACE INTO extension_assignments
-            (extension, first_name, last_name, member_identifier, updated_at)
-            VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-        """, (extension, first_name, last_name, member_identifier))
+        self._reload_names()
 
-        conn.commit()
-        conn.close()
+    def _reload_names(self):
+        """Refresh the in-memory extension -> name map from the table"""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.arraysize = SCAN_BATCH_SIZE
+
+            cursor.execute("SELECT extension, first_name, last_name FROM extension_assignments")
+
+            names = {row[0]: (row[1], row[2]) for batch in iter(cursor.fetchmany, []) for row in batch}
+
+        self._names = names
+        self.version += 1
+
+    def names_by_extension(self) -> Mapping[str, Tuple[str, str]]:
+        """Current extension -> (first_name, last_name) map, without touching SQLite"""
+        return self._names
 
     def get_assignment(self, extension: str) -> Optional[Dict]:
         """Get the technician assigned to an extension"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
 
-        cursor.execute("""
-            SELECT extension, first_name, last_name, member_identifier, assigned_date, updated_at
-            FROM extension_assignments
-            WHERE extension = ?
-        """, (extension,))
+            cursor.execute("""
+                SELECT extension, first_name, last_name, member_identifier, assigned_date, updated_at
+                FROM extension_assignments
+                WHERE extension = ?
+            """, (extension,))
 
-        result = cursor.fetchone()
-        conn.close()
+            result = cursor.fetchone()
 
         return dict(result) if result else None
 
     def get_all_assignments(self) -> List[Dict]:
         """Get all extension assignments"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT extension, first_name, last_name, member_identifier, assigned_date, updated_at
-            FROM extension_assignments
-            ORDER BY extension
-        """)
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.arraysize = SCAN_BATCH_SIZE
 
-        results = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+            cursor.execute("""
+                SELECT extension, first_name, last_name, member_identifier, assigned_date, updated_at
+                FROM extension_assignments
+                ORDER BY extension
+            """)
 
-        return results
+            return [dict(row) for batch in iter(cursor.fetchmany, []) for row in batch]
 
     def remove_assignment(self, extension: str):
         """Remove an extension assignment"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
 
-        cursor.execute("DELETE FROM extension_assignments WHERE extension = ?", (extension,))
+            cursor.execute("DELETE FROM extension_assignments WHERE extension = ?", (extension,))
 
-        conn.commit()
-        conn.close()
+        self._reload_names()
 
     def get_assigned_names(self) -> set:
         """Get set of all assigned (first_name, last_name) tuples"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.arraysize = SCAN_BATCH_SIZE
+
+            cursor.execute("SELECT first_name, last_name FROM extension_assignments")
+
+            return set((row[0], row[1]) for batch in iter(cursor.fetchmany, []) for row in batch)
+
+
+class ExtensionResolver:
+    """
+    Hardcoded and database-assigned extensions merged into one lookup table
+    Database assignments win over hardcoded ones. The table is rebuilt from
+    ExtensionAssignments' in-memory copy when an assignment changes, so
+    resolving an extension never touches SQLite.
+    """
+
+    def __init__(self, hardcoded: Mapping[str, Tuple[str, str]],
+                 overrides: Mapping[str, Tuple[str, str]],
+                 assignments: ExtensionAssignments):
+        self._hardcoded = hardcoded
+        self._overrides = overrides
+        self._assignments = assignments
+        self._version = None
+        self._table: Dict[str, ResolvedExtension] = {}
+        self._assigned_names: FrozenSet[Tuple[str, str]] = frozenset()
+
+    def _entry(self, extension: str, names: Tuple[str, str], source: str) -> ResolvedExtension:
+        cw_names = self._overrides.get(extension, names)
+        return ResolvedExtension(*names, *cw_names, extension in self._overrides, source)
+
+    def _refresh(self):
+        """Rebuild the merged table if assignments changed since the last build"""
+        version = self._assignments.version
+        if version == self._version:
+            return
+
+        db_names = self._assignments.names_by_extension()
+        table = {ext: self._entry(ext, names, "hardcoded") for ext, names in self._hardcoded.items()}
+        table.update((ext, self._entry(ext, names, "from database")) for ext, names in db_names.items())
+
+        self._table = table
+        self._assigned_names = frozenset(self._hardcoded.values()) | frozenset(db_names.values())
+        self._version = version
 
-        cursor.execute("SELECT first_name, last_name FROM extension_assignments")
-        results = cursor.fetchall()
-        conn.close()
+    def resolve(self, extension: str) -> Optional[ResolvedExtension]:
+        """Technician for an extension, or None if it isn't known"""
+        self._refresh()
+        return self._table.get(extension)
 
-        return set(results)
+    def assigned_names(self) -> FrozenSet[Tuple[str, str]]:
+        """(first_name, last_name) of every technician that has an extension"""
+        self._refresh()
+        return self._assigned_names
@@ -4,46 +4,65 @@ With SQLite caching, multiple match handling, and contact creation workflow
 """
 
 import os
-import base64
+import re
+import gzip
+import hashlib
+import mimetypes
 import asyncio
-from typing import Optional, List, Dict
+import logging
+import logging.handlers
+import queue
+from functools import lru_cache
+from typing import Optional, List, Dict, Tuple, Iterator
 from datetime import datetime
 from pathlib import Path
-from fastapi import FastAPI, Query, Request, BackgroundTasks, Form
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, FileResponse
-import httpx
+from urllib.parse import quote
+from types import MappingProxyType
+from fastapi import FastAPI, Query, Request
+from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
+from fastapi.responses import Response, HTMLResponse, RedirectResponse, ORJSONResponse, StreamingResponse
+import orjson
+from cachetools import TTLCache
+from pydantic import BaseModel
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from markupsafe import Markup, escape
 from dotenv import load_dotenv
 
-from database import PhoneCache, ExtensionAssignments
+from database import AsyncPhoneCache, ExtensionAssignments, ExtensionResolver, CacheHit
 from connectwise_api import (
     search_companies,
     get_company_by_id,
     get_company_contacts,
-    get_company_tickets,
+    iter_company_contacts,
+    get_company_bundle,
+    single_flight,
+    iter_pages,
     add_phone_to_contact,
     create_contact_with_phone,
     create_company_and_contact,
     create_ticket,
     activate_company_finance,
-    get_cw_headers as cw_get_cw_headers,
     get_member_by_name,
-    get_member_tickets
+    get_member_tickets,
+    get_all_members,
+    get_client as get_cw_client,
+    close_client as close_cw_client
 )
 
 # Load environment variables
 load_dotenv()
 
 # Configuration
-CW_CLIENT_ID = os.getenv("CW_CLIENT_ID")
-CW_PUBLIC_KEY = os.getenv("CW_PUBLIC_API_KEY")
-CW_PRIVATE_KEY = os.getenv("CW_PRIVATE_API_KEY")
-CW_COMPANY_ID = os.getenv("CW_COMPANY_ID")
 CW_BASE_URL = os.getenv("CW_BASE_URL")
 NILEAR_BASE_URL = os.getenv("NILEAR_BASE_URL", "https://mtx.link")
 SYNC_INTERVAL_HOURS = int(os.getenv("SYNC_INTERVAL_HOURS", "4"))
+# Compiled template cache shared by every process on the host; unset uses Jinja's per-user temp dir
+JINJA_CACHE_DIR = os.getenv("JINJA_CACHE_DIR")
 
 # Internal extension mapping for technician screenpops
-INTERNAL_EXTENSIONS = {
+INTERNAL_EXTENSIONS = MappingProxyType({
     "9401": ("Miguel", "Sahagun"),
     "1337": ("Steven", "Olsen"),
     "9405": ("Roy", "Morla"),
@@ -53,43 +72,249 @@ INTERNAL_EXTENSIONS = {
     "1001": ("Katelyn", "Erk"),
     "1738": ("Bart", "Verwilt"),
     "9404": ("Daniel", "Glick")
-}
+})
 
 # Special cases where extension name differs from ConnectWise member name
-CONNECTWISE_NAME_OVERRIDES = {
+CONNECTWISE_NAME_OVERRIDES = MappingProxyType({
     "1001": ("CNS Service", "Desk")  # Katelyn Erk is "CNS Service Desk" in ConnectWise
-}
+})
+
+# Logging: handlers only enqueue records; a QueueListener thread (started on startup) does the I/O
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+log = logging.getLogger("screenpop")
+log.setLevel(LOG_LEVEL)
+log.propagate = False
+_log_queue = queue.SimpleQueue()
+log.addHandler(logging.handlers.QueueHandler(_log_queue))
+_log_stream_handler = logging.StreamHandler()
+_log_stream_handler.setFormatter(logging.Formatter("%(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream_handler)
+
+# ConnectWise communication item types that hold phone numbers (cached by the sync)
+PHONE_ITEM_TYPES = frozenset({"Direct", "Cell", "Fax", "Phone", "Mobile"})
+
+# Ticket priority badge classes (colours live in static/tickets.css)
+TICKET_PRIORITY_CLASSES = MappingProxyType({
+    "Priority 1 - Emergency Response": "badge-p1",
+    "Priority 2 - Quick Response": "badge-p2",
+    "Priority 3 - Normal Response": "badge-p3",
+    "Priority 4 - Schedule Maintenance": "badge-p4",
+    "Priority 5 - Next Time": "badge-p5",
+    "Do Not Respond": "badge-dnr"
+})
+DEFAULT_PRIORITY_CLASS = "badge-p3"  # Normal response yellow
+
+_BADGE_HTML = Markup('<span class="badge {}">{}</span>')
+
+# Known priority badges rendered once; only unexpected priorities are formatted per ticket
+PRIORITY_BADGE_HTML = MappingProxyType({
+    priority: _BADGE_HTML.format(css_class, priority)
+    for priority, css_class in TICKET_PRIORITY_CLASSES.items()
+})
+
+
+def priority_badge(priority: str) -> Markup:
+    """Coloured badge for a ticket priority"""
+    badge = PRIORITY_BADGE_HTML.get(priority)
+    return badge if badge is not None else _BADGE_HTML.format(DEFAULT_PRIORITY_CLASS, priority)
+
+
+def ref_name(record: Dict, key: str, default: str = "Unknown") -> str:
+    """Name of a ConnectWise reference field (e.g. a ticket's status), or default if it's missing"""
+    ref = record.get(key)
+    return ref.get("name", default) if ref else default
+
+
+def short_summary(summary: str, limit: int = 80) -> str:
+    """Ticket summary cut to fit a table row"""
+    return summary if len(summary) <= limit else summary[:limit] + "..."
+
+
+_CONTACT_OPTION_HTML = Markup('<option value="{}">{}</option>')
+
+
+@lru_cache(maxsize=512)
+def contact_options_html(contacts: tuple) -> Markup:
+    """<option> list for the ticket form's contact picker, from (id, first, last) tuples
+
+    Keyed on the contacts themselves, so a company's list is only rebuilt when its contacts change.
+    """
+    return Markup("").join(
+        _CONTACT_OPTION_HTML.format(contact_id, f"{first_name} {last_name}".strip())
+        for contact_id, first_name, last_name in contacts
+    )
+
+
+# A board only has a handful of statuses, so after the first page each badge is a cache hit
+@lru_cache(maxsize=128)
+def status_badge(status: str) -> Markup:
+    """Badge for a ticket status, green for new tickets"""
+    return _BADGE_HTML.format("badge-new" if "new" in status.lower() else "badge-status", status)
+
+
+_HTML_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+
+
+def minify_html(markup: str) -> str:
+    """Drop HTML comments, indentation and blank lines; line breaks stay so inline JS is untouched"""
+    lines = (line.strip() for line in _HTML_COMMENT.sub("", markup).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+class MinifyingLoader(FileSystemLoader):
+    """FileSystemLoader that minifies template source before Jinja compiles it"""
+
+    def get_source(self, environment, template):
+        source, filename, uptodate = super().get_source(environment, template)
+        return minify_html(source), filename, uptodate
+
+
+STATIC_DIR = Path(__file__).parent / "static"
+
+# Content hash of each static file; pages link to static_url(), so a deploy changes the URLs browsers cache
+STATIC_VERSIONS = MappingProxyType({
+    file.name: hashlib.blake2b(file.read_bytes(), digest_size=6).hexdigest()
+    for file in STATIC_DIR.iterdir() if file.is_file()
+})
+
+
+def static_url(name: str) -> str:
+    """URL of a static file, versioned by its content"""
+    return f"/static/{name}?v={STATIC_VERSIONS[name]}"
+
+
+# Checked once at startup so pages can drop the tag instead of relying on a client-side onerror
+LOGO_HTML = (
+    Markup('<img src="{}" alt="CNS4U Logo" class="logo">').format(static_url("logo-darkbg.png"))
+    if (STATIC_DIR / "logo-darkbg.png").exists()
+    else Markup("")
+)
+
+# Page templates are compiled once at import; the bytecode cache lets restarts and other workers
+# skip compiling. Entries are keyed on a checksum of the template source, so a deploy never reads stale code.
+if JINJA_CACHE_DIR:
+    os.makedirs(JINJA_CACHE_DIR, exist_ok=True)
+templates = Environment(
+    loader=MinifyingLoader(Path(__file__).parent / "templates"),
+    autoescape=True,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,  # templates ship with the app; skip the per-render mtime check
+    bytecode_cache=FileSystemBytecodeCache(JINJA_CACHE_DIR),
+)
+templates.globals.update(
+    priority_badge=priority_badge,
+    status_badge=status_badge,
+    short_summary=short_summary,
+    ref_name=ref_name,
+    static_url=static_url,
+    logo=LOGO_HTML
+)
+COMPANY_INFO_TEMPLATE = templates.get_template("company_info.html")
+COMPANY_SELECTION_TEMPLATE = templates.get_template("company_selection.html")
+CONTACT_SELECTION_TEMPLATE = templates.get_template("contact_selection.html")
+TECHNICIAN_TICKETS_TEMPLATE = templates.get_template("technician_tickets.html")
+UNASSIGNED_TECHNICIANS_TEMPLATE = templates.get_template("unassigned_technicians.html")
+ERROR_TEMPLATE = templates.get_template("error.html")
+NOT_FOUND_TEMPLATE = templates.get_template("not_found.html")
 
 # Ensure data directory exists
 Path("data").mkdir(exist_ok=True)
 
 # Initialize cache and extension assignments
-cache = PhoneCache("data/phone_cache.db")
+cache = AsyncPhoneCache("data/phone_cache.db")
 extension_assignments = ExtensionAssignments("data/phone_cache.db")
+extension_resolver = ExtensionResolver(INTERNAL_EXTENSIONS, CONNECTWISE_NAME_OVERRIDES, extension_assignments)
+
+# Extension assignments are written on the cache's writer thread (reads come from the resolver's in-memory copy)
+db_write = cache.run_write
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers keep files requested by their current static_url()
+
+    Any other URL (no version, or one from before a deploy) must be revalidated, which its ETag keeps cheap.
+    Stylesheets and scripts are gzipped once at startup and sent as-is to clients that accept gzip,
+    instead of GZipMiddleware compressing them again on every fetch.
+    """
+
+    VERSIONED_CACHE_CONTROL = "public, max-age=31536000, immutable"
+    UNVERSIONED_CACHE_CONTROL = "no-cache"
+    PRECOMPRESSED_SUFFIXES = (".css", ".js")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gzipped = {}
+        for file in Path(self.directory).iterdir():
+            if file.suffix in self.PRECOMPRESSED_SUFFIXES:
+                body = gzip.compress(file.read_bytes(), compresslevel=9, mtime=0)
+                self.gzipped[file.name] = (body, f'"{hashlib.md5(body).hexdigest()}-gz"')
+
+    async def get_response(self, path: str, scope) -> Response:
+        entry = self.gzipped.get(path)
+        if entry is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+        headers = Headers(scope=scope)
+        if "gzip" not in headers.get("accept-encoding", ""):
+            return await super().get_response(path, scope)
+
+        body, etag = entry
+        response_headers = {
+            "Cache-Control": self.cache_control(path, scope),
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+        }
+        if headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=response_headers)
+        # GZipMiddleware leaves responses that already carry Content-Encoding alone
+        response_headers["Content-Encoding"] = "gzip"
+        return Response(
+            content=body,
+            media_type=mimetypes.guess_type(path)[0],
+            headers=response_headers
+        )
+
+    def cache_control(self, name: str, scope) -> str:
+        version = STATIC_VERSIONS.get(name)
+        if version and scope.get("query_string") == f"v={version}".encode():
+            return self.VERSIONED_CACHE_CONTROL
+        return self.UNVERSIONED_CACHE_CONTROL
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        response.headers.setdefault("Cache-Control", self.cache_control(Path(full_path).name, scope))
+        return response
+
 
 # Create FastAPI app
-app = FastAPI(title="8x8 Nilear Screenpop", version="2.1.0")
+app = FastAPI(title="8x8 Nilear Screenpop", version="2.1.0", default_response_class=ORJSONResponse)
+app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
+# Pages are mostly repeated markup, so compress anything past 512 bytes (tiny JSON replies go out as-is)
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
 
 # Track last sync time
 last_sync_time = None
 
 
-def get_cw_headers():
-    """Generate ConnectWise API headers with authentication"""
-    auth_string = f"{CW_COMPANY_ID}+{CW_PUBLIC_KEY}:{CW_PRIVATE_KEY}"
-    auth_encoded = base64.b64encode(auth_string.encode()).decode()
-    
-    return {
-        "Authorization": f"Basic {auth_encoded}",
-        "ClientId": CW_CLIENT_ID,
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
+class _DigitsOnlyTable(dict):
+    """
+    str.translate table that deletes every non-digit character
+    Entries are filled in the first time translate() meets a character, so it
+    covers all of Unicode without building a table for it up front.
+    """
+
+    def __missing__(self, codepoint: int):
+        value = self[codepoint] = None if not chr(codepoint).isdigit() else codepoint
+        return value
 
 
+_KEEP_DIGITS = _DigitsOnlyTable()
+
+
+# Callers ring in again and again, so repeat numbers skip the translate
+@lru_cache(maxsize=4096)
 def normalize_phone(phone: str) -> str:
     """Normalize phone number by removing non-digit characters"""
-    return ''.join(filter(str.isdigit, phone))
+    return phone.translate(_KEEP_DIGITS)
 
 
 async def sync_phone_cache_from_connectwise(sync_type: str = "auto"):
@@ -99,113 +324,78 @@ async def sync_phone_cache_from_connectwise(sync_type: str = "auto"):
     """
     global last_sync_time
     
-    print(f"\n{'='*60}")
-    print(f"🔄 STARTING CACHE SYNC ({sync_type})")
-    print(f"{'='*60}\n")
+    global _current_sync_id
+    
+    log.info("\n%s\n🔄 STARTING CACHE SYNC (%s)\n%s\n", "=" * 60, sync_type, "=" * 60)
     
-    sync_id = cache.start_sync(sync_type)
+    sync_id = _current_sync_id = await cache.start_sync(sync_type)
     records_processed = 0
     records_added = 0
     records_updated = 0
     
     try:
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            page = 1
-            page_size = 100
-            has_more = True
+        # Fetch contact pages from ConnectWise concurrently, handling each as it arrives
+        # so only the pages in flight are held in memory
+        pages = iter_pages(
+            "/company/contacts",
+            params={
+                "orderBy": "id desc",
+                "fields": "id,firstName,lastName,company,communicationItems"
+            },
+            page_size=100,
+            max_pages=100  # Limit to prevent runaway syncs (safety): max 10,000 contacts
+        )
+        
+        async for page, contacts in pages:
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Syncing page %d...", page)
             
-            while has_more:
-                print(f"Syncing page {page}...")
-                
-                # Fetch contacts from ConnectWise
-                url = f"{CW_BASE_URL}/company/contacts"
-                params = {
-                    "page": page,
-                    "pageSize": page_size,
-                    "orderBy": "id desc",
-                    "fields": "id,firstName,lastName,company,communicationItems"
-                }
-                
-                response = await client.get(
-                    url,
-                    headers=get_cw_headers(),
-                    params=params
-                )
+            # Rows for this page, written in one transaction once the page is processed
+            page_rows = []
+            
+            # Process each contact
+            for contact in contacts:
+                records_processed += 1
                 
-                if response.status_code != 200:
-                    print(f"Error fetching page {page}: {response.status_code}")
-                    break
+                company = contact.get("company", {})
+                company_id = company.get("id")
+                company_name = company.get("name", "Unknown")
                 
-                contacts = response.json()
+                # Skip contacts without company
+                if not company_id:
+                    continue
                 
-                if not contacts or len(contacts) == 0:
-                    has_more = False
-                    break
+                contact_id = contact.get("id")
+                contact_name = f"{contact.get('firstName', '')} {contact.get('lastName', '')}".strip()
                 
-                # Process each contact
-                for contact in contacts:
-                    records_processed += 1
-                    
-                    company = contact.get("company", {})
-                    company_id = company.get("id")
-                    company_name = company.get("name", "Unknown")
+                # Extract phone numbers from communicationItems
+                comm_items = contact.get("communicationItems", [])
+                for item in comm_items:
+                    item_type = ref_name(item, "type", "")
                     
-                    # Skip contacts without company
-                    if not company_id:
-                        continue
-                    
-                    contact_id = contact.get("id")
-                    contact_name = f"{contact.get('firstName', '')} {contact.get('lastName', '')}".strip()
-                    
-                    # Extract phone numbers from communicationItems
-                    comm_items = contact.get("communicationItems", [])
-                    for item in comm_items:
-                        item_type = item.get("type", {}).get("name", "")
-                        
-                        # Only cache phone numbers (not emails)
-                        if item_type in ["Direct", "Cell", "Fax", "Phone", "Mobile"]:
-                            phone_value = item.get("value", "")
-                            if phone_value:
-                                normalized = normalize_phone(phone_value)
-                                
-                                if len(normalized) >= 10:  # Valid phone number
-                                    # Check if this is new or updated
-                                    existing = cache.lookup(normalized)
-                                    is_new = not any(
-                                        r["company_id"] == company_id and r["contact_id"] == contact_id
-                                        for r in existing
-                                    )
-                                    
-                                    cache.add_or_update(
-                                        phone_number=phone_value,
-                                        normalized_phone=normalized,
-                                        company_id=company_id,
-                                        company_name=company_name,
-                                        contact_id=contact_id,
-                                        contact_name=contact_name,
-                                        contact_type=item_type
-                                    )
-                                    
-                                    if is_new:
-                                        records_added += 1
-                                    else:
-                                        records_updated += 1
-                
-                print(f"  Processed {len(contacts)} contacts")
-                
-                # Move to next page
-                if len(contacts) < page_size:
-                    has_more = False
-                else:
-                    page += 1
-                
-                # Limit to prevent infinite loops (safety)
-                if page > 100:  # Max 10,000 contacts
-                    print("⚠️  Reached page limit (100), stopping sync")
-                    break
+                    # Only cache phone numbers (not emails)
+                    if item_type in PHONE_ITEM_TYPES:
+                        phone_value = item.get("value", "")
+                        # Fewer than 10 characters can't hold 10 digits, so skip normalizing it
+                        if phone_value and len(phone_value) >= 10:
+                            # Uncached: a sync sees every number once and would only churn the LRU
+                            normalized = phone_value.translate(_KEEP_DIGITS)
+                            
+                            if len(normalized) >= 10:  # Valid phone number
+                                page_rows.append((
+                                    phone_value, normalized, company_id, company_name,
+                                    contact_id, contact_name, item_type
+                                ))
+            
+            # The upsert decides new vs existing; the cache reports how many of each
+            added, updated = await cache.add_or_update_many(page_rows)
+            records_added += added
+            records_updated += updated
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("  Processed %d contacts", len(contacts))
         
         # Mark sync as completed
-        cache.complete_sync(
+        await cache.complete_sync(
             sync_id=sync_id,
             records_processed=records_processed,
             records_added=records_added,
@@ -215,14 +405,14 @@ async def sync_phone_cache_from_connectwise(sync_type: str = "auto"):
         
         last_sync_time = datetime.now()
         
-        print(f"\n✅ SYNC COMPLETED")
-        print(f"  Processed: {records_processed} contacts")
-        print(f"  Added: {records_added} new records")
-        print(f"  Updated: {records_updated} existing records\n")
+        log.info(
+            "\n✅ SYNC COMPLETED\n  Processed: %d contacts\n  Added: %d new records\n  Updated: %d existing records\n",
+            records_processed, records_added, records_updated
+        )
         
     except Exception as e:
-        print(f"\n❌ SYNC FAILED: {str(e)}\n")
-        cache.complete_sync(
+        log.error("\n❌ SYNC FAILED: %s\n", e)
+        await cache.complete_sync(
             sync_id=sync_id,
             records_processed=records_processed,
             records_added=records_added,
@@ -232,21 +422,48 @@ async def sync_phone_cache_from_connectwise(sync_type: str = "auto"):
         )
 
 
+# At most one sync runs at a time; triggers that arrive while it runs share it
+_current_sync: Optional[asyncio.Task] = None
+_current_sync_id: Optional[int] = None
+
+
+def sync_in_progress() -> bool:
+    """True while a cache sync task is running"""
+    return _current_sync is not None and not _current_sync.done()
+
+
+def start_background_sync(sync_type: str) -> asyncio.Task:
+    """Start a cache sync, or return the one already in flight"""
+    global _current_sync
+    
+    if sync_in_progress():
+        log.info("⏭️  Sync already running, not starting another (%s)", sync_type)
+    else:
+        _current_sync = asyncio.create_task(sync_phone_cache_from_connectwise(sync_type=sync_type))
+    return _current_sync
+
+
 async def periodic_sync_task():
     """Background task that syncs cache every N hours"""
     global last_sync_time
     
+    loop = asyncio.get_running_loop()
+    interval = SYNC_INTERVAL_HOURS * 3600
+    # Deadlines are fixed on the monotonic clock so sync duration doesn't push the schedule
+    next_at = loop.time() + interval
+    
     while True:
+        await asyncio.sleep(max(0, next_at - loop.time()))
+        next_at += interval
         try:
-            # Wait for sync interval
-            await asyncio.sleep(SYNC_INTERVAL_HOURS * 3600)
-            
-            print(f"\n⏰ Auto-sync triggered (every {SYNC_INTERVAL_HOURS} hours)")
-            await sync_phone_cache_from_connectwise(sync_type="auto")
+            log.info("\n⏰ Auto-sync triggered (every %d hours)", SYNC_INTERVAL_HOURS)
+            # Shielded so cancelling this loop leaves the sync running; shutdown_event waits for it
+            await asyncio.shield(start_background_sync("auto"))
             
         except Exception as e:
-            print(f"Error in periodic sync: {str(e)}")
-            await asyncio.sleep(300)  # Wait 5 minutes before retrying
+            log.error("Error in periodic sync: %s", e)
+            # Retry in 5 minutes, unless the next scheduled run is sooner
+            next_at = min(next_at, loop.time() + 300)
 
 
 @app.on_event("startup")
@@ -254,115 +471,61 @@ async def startup_event():
     """Run on server startup"""
     global last_sync_time
     
+    _log_listener.start()
+    
     # Check if cache is empty or stale
-    stats = cache.get_cache_stats()
+    stats = await cache.get_cache_stats()
+    cache_age = await cache.get_stale_cache_age()
     
     if stats["unique_phones"] == 0:
-        print("\n⚠️  Cache is empty, running initial sync...")
-        asyncio.create_task(sync_phone_cache_from_connectwise(sync_type="initial"))
-    elif cache.get_stale_cache_age() and cache.get_stale_cache_age() > SYNC_INTERVAL_HOURS:
-        print(f"\n⚠️  Cache is stale ({cache.get_stale_cache_age()} hours old), syncing...")
-        asyncio.create_task(sync_phone_cache_from_connectwise(sync_type="startup"))
+        log.warning("\n⚠️  Cache is empty, running initial sync...")
+        start_background_sync("initial")
+    elif cache_age and cache_age > SYNC_INTERVAL_HOURS:
+        log.warning("\n⚠️  Cache is stale (%s hours old), syncing...", cache_age)
+        start_background_sync("startup")
     else:
-        print(f"\n✅ Cache is fresh ({stats['unique_phones']} phones cached)")
+        log.info("\n✅ Cache is fresh (%d phones cached)", stats["unique_phones"])
     
     # Start periodic sync task
-    asyncio.create_task(periodic_sync_task())
+    app.state.sync_task = asyncio.create_task(periodic_sync_task())
 
+    # Open the shared ConnectWise client so the first screenpop doesn't pay for it
+    get_cw_client()
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Root endpoint with service information"""
-    stats = cache.get_cache_stats()
-    
-    return f"""
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Run on server shutdown"""
+    sync_task = getattr(app.state, "sync_task", None)
+    if sync_task:
+        sync_task.cancel()
+        try:
+            await sync_task
+        except asyncio.CancelledError:
+            pass
+    # The sync itself is shielded; let it finish its writes before the client and cache threads go away
+    if sync_in_progress():
+        log.info("⏳ Waiting for the running sync to finish...")
+        await _current_sync
+    await close_cw_client()
+    cache.close()
+    extension_assignments.close()
+    _log_listener.stop()
+
+
+# Landing page markup is constant apart from three numbers, so it is built once at import
+ROOT_PAGE_TEMPLATE = minify_html("""
     <html>
         <head>
             <title>CNS4U - 8x8 Screenpop Service</title>
+            <link rel="preconnect" href="https://fonts.googleapis.com">
+            <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
             <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600&family=Lato:wght@700&display=swap" rel="stylesheet">
-            <style>
-                body {{
-                    font-family: 'Poppins', sans-serif;
-                    max-width: 1000px;
-                    margin: 0 auto;
-                    padding: 0;
-                    background: #f4f4f4;
-                    color: #58595a;
-                }}
-                .header {{
-                    background: #545454;
-                    padding: 20px 40px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                .logo {{
-                    max-width: 300px;
-                    height: auto;
-                }}
-                .container {{
-                    background: white;
-                    padding: 40px;
-                    margin: 0;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-                }}
-                h1 {{
-                    margin-top: 0;
-                    color: #333333;
-                    font-family: 'Lato', sans-serif;
-                    font-weight: 700;
-                }}
-                .status {{ color: #6bb545; font-weight: 600; }}
-                .stats {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-                    gap: 15px;
-                    margin: 20px 0;
-                }}
-                .stat-card {{
-                    background: #f1f1f1;
-                    padding: 15px;
-                    border-radius: 8px;
-                    border-left: 4px solid #01aeed;
-                }}
-                .stat-label {{ font-size: 12px; color: #58595a; text-transform: uppercase; font-weight: 600; }}
-                .stat-value {{ font-size: 24px; font-weight: 700; color: #333333; }}
-                code {{
-                    background: #f1f1f1;
-                    padding: 4px 12px;
-                    border-radius: 4px;
-                    font-family: 'Courier New', monospace;
-                    color: #01aeed;
-                    font-weight: 500;
-                }}
-                .endpoint {{
-                    background: #f1f1f1;
-                    padding: 15px;
-                    margin: 10px 0;
-                    border-left: 4px solid #01aeed;
-                    border-radius: 4px;
-                }}
-                a {{
-                    color: #01aeed;
-                    text-decoration: none;
-                    font-weight: 500;
-                }}
-                a:hover {{
-                    color: #dd2b28;
-                    text-decoration: none;
-                }}
-                h2 {{
-                    color: #333333;
-                    font-family: 'Lato', sans-serif;
-                    font-weight: 700;
-                    margin-top: 30px;
-                }}
-                ul {{
-                    line-height: 1.8;
-                }}
-            </style>
+            <link rel="stylesheet" href="{home_css}">
         </head>
         <body>
             <div class="header">
-                <img src="/static/logo-darkbg.png" alt="CNS4U Logo" class="logo" onerror="this.style.display='none'">
+                {logo}
             </div>
             <div class="container">
                 <h1>8x8 Screenpop Service v2.1</h1>
@@ -372,15 +535,15 @@ async def root():
                 <div class="stats">
                     <div class="stat-card">
                         <div class="stat-label">Cached Phone Numbers</div>
-                        <div class="stat-value">{stats['unique_phones']}</div>
+                        <div class="stat-value">{unique_phones}</div>
                     </div>
                     <div class="stat-card">
                         <div class="stat-label">Total Records</div>
-                        <div class="stat-value">{stats['total_records']}</div>
+                        <div class="stat-value">{total_records}</div>
                     </div>
                     <div class="stat-card">
                         <div class="stat-label">Auto-Sync Interval</div>
-                        <div class="stat-value">{SYNC_INTERVAL_HOURS}h</div>
+                        <div class="stat-value">{sync_h}h</div>
                     </div>
                 </div>
                 
@@ -424,30 +587,26 @@ async def root():
             </div>
         </body>
     </html>
-    """
+""").format
 
 
-@app.get("/static/{filename}")
-async def serve_static(filename: str):
-    """Serve static files (logos)"""
-    file_map = {
-        "logo-darkbg.png": "logo-1024px-darkbg-logo.png",
-        "logo-lightbg.png": "logo-1024px-lightbg-logo.png"
-    }
-
-    actual_filename = file_map.get(filename)
-    if actual_filename:
-        file_path = Path(__file__).parent / actual_filename
-        if file_path.exists():
-            return FileResponse(file_path)
-
-    return JSONResponse({"error": "File not found"}, status_code=404)
+@app.get("/", response_class=HTMLResponse)
+async def root():
+    """Root endpoint with service information"""
+    stats = await cache.get_cache_stats()
+    return ROOT_PAGE_TEMPLATE(
+        logo=LOGO_HTML,
+        home_css=static_url("home.css"),
+        unique_phones=stats["unique_phones"],
+        total_records=stats["total_records"],
+        sync_h=SYNC_INTERVAL_HOURS,
+    )
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint with cache stats"""
-    stats = cache.get_cache_stats()
+    stats = await cache.get_cache_stats()
     
     return {
         "status": "healthy",
@@ -469,65 +628,75 @@ async def health_check():
     }
 
 
+# Fully static, so keep the encoded body around instead of re-encoding per request
+SYNC_CONFIRM_PAGE = minify_html("""
+    <html>
+        <head>
+            <style>
+                body {
+                    font-family: Arial, sans-serif;
+                    max-width: 600px;
+                    margin: 100px auto;
+                    padding: 20px;
+                    text-align: center;
+                }
+                .button {
+                    display: inline-block;
+                    padding: 15px 30px;
+                    background: #667eea;
+                    color: white;
+                    text-decoration: none;
+                    border-radius: 8px;
+                    font-size: 18px;
+                    margin: 10px;
+                }
+                .button:hover {
+                    background: #5568d3;
+                }
+                .danger {
+                    background: #dc2626;
+                }
+                .danger:hover {
+                    background: #b91c1c;
+                }
+            </style>
+        </head>
+        <body>
+            <h1>Force Cache Sync</h1>
+            <p>This will synchronize all phone numbers from ConnectWise.<br>
+            This may take several minutes depending on your database size.</p>
+            <a href="/sync?force=true" class="button danger">Start Sync Now</a>
+            <a href="/" class="button">Cancel</a>
+        </body>
+    </html>
+""").encode("utf-8")
+
+
 @app.get("/sync")
 @app.post("/sync")
-async def force_sync(background_tasks: BackgroundTasks, force: bool = Query(False)):
+async def force_sync(force: bool = Query(False)):
     """Force a cache sync"""
     if force:
-        background_tasks.add_task(sync_phone_cache_from_connectwise, sync_type="manual")
+        if sync_in_progress():
+            return {
+                "status": "sync_already_running",
+                "message": "A sync is already in progress",
+                "sync_id": _current_sync_id
+            }
+        start_background_sync("manual")
         return {
             "status": "sync_started",
             "message": "Manual sync has been triggered in the background",
             "sync_type": "manual"
         }
     else:
-        return HTMLResponse(content="""
-            <html>
-                <head>
-                    <style>
-                        body {
-                            font-family: Arial, sans-serif;
-                            max-width: 600px;
-                            margin: 100px auto;
-                            padding: 20px;
-                            text-align: center;
-                        }
-                        .button {
-                            display: inline-block;
-                            padding: 15px 30px;
-                            background: #667eea;
-                            color: white;
-                            text-decoration: none;
-                            border-radius: 8px;
-                            font-size: 18px;
-                            margin: 10px;
-                        }
-                        .button:hover {
-                            background: #5568d3;
-                        }
-                        .danger {
-                            background: #dc2626;
-                        }
-                        .danger:hover {
-                            background: #b91c1c;
-                        }
-                    </style>
-                </head>
-                <body>
-                    <h1>Force Cache Sync</h1>
-                    <p>This will synchronize all phone numbers from ConnectWise.<br>
-                    This may take several minutes depending on your database size.</p>
-                    <a href="/sync?force=true" class="button danger">Start Sync Now</a>
-                    <a href="/" class="button">Cancel</a>
-                </body>
-            </html>
-        """)
+        return Response(content=SYNC_CONFIRM_PAGE, media_type="text/html")
 
 
 @app.get("/cache/clear")
 async def clear_cache():
     """Clear all cached data"""
-    cache.clear_cache()
+    await cache.clear_cache()
     return {
         "status": "cache_cleared",
         "message": "All cached data has been cleared. A new sync will be triggered on next lookup."
@@ -538,13 +707,13 @@ async def clear_cache():
 async def test_lookup(phone: str = Query(..., description="Phone number to test")):
     """Test endpoint to verify lookup"""
     normalized = normalize_phone(phone)
-    cached_results = cache.lookup(normalized)
+    cached_results = await cache.lookup(normalized)
     
     result = {
         "phone_number": phone,
         "normalized": normalized,
         "cache_hit": len(cached_results) > 0,
-        "cache_results": cached_results
+        "cache_results": [r._asdict() for r in cached_results]
     }
     
     if not cached_results:
@@ -575,186 +744,224 @@ async def api_search_companies(q: str = Query(..., min_length=2)):
         for c in companies
     ]
     
-    return JSONResponse(content=results)
+    return ORJSONResponse(content=results)
+
+
+def contact_summary(c: Dict) -> Dict:
+    """Contact fields the contact picker needs"""
+    return {
+        "id": c.get("id"),
+        "name": f"{c.get('firstName', '')} {c.get('lastName', '')}".strip(),
+        "firstName": c.get("firstName"),
+        "lastName": c.get("lastName"),
+        "phones": [
+            item.get("value")
+            for item in c.get("communicationItems", [])
+            if item.get("communicationType") == "Phone"
+        ]
+    }
 
 
 @app.get("/api/companies/{company_id}/contacts")
-async def api_get_company_contacts(company_id: int):
-    """Get all contacts for a company"""
+async def api_get_company_contacts(company_id: int, request: Request):
+    """
+    Get all contacts for a company
+    Clients that accept application/x-ndjson get one contact per line, sent as each page arrives
+    """
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        async def stream_contacts():
+            async for contacts in iter_company_contacts(company_id):
+                yield b"".join(orjson.dumps(contact_summary(c)) + b"\n" for c in contacts)
+
+        return StreamingResponse(stream_contacts(), media_type="application/x-ndjson")
+
     contacts = await get_company_contacts(company_id)
-    
-    # Format contact data
-    results = [
-        {
-            "id": c.get("id"),
-            "name": f"{c.get('firstName', '')} {c.get('lastName', '')}".strip(),
-            "firstName": c.get("firstName"),
-            "lastName": c.get("lastName"),
-            "phones": [
-                item.get("value")
-                for item in c.get("communicationItems", [])
-                if item.get("communicationType") == "Phone"
-            ]
-        }
-        for c in contacts
-    ]
-    
-    return JSONResponse(content=results)
+    return ORJSONResponse(content=[contact_summary(c) for c in contacts])
+
+
+# JSON bodies posted by the page scripts
+class AddPhoneRequest(BaseModel):
+    phone: str
+    phone_type: str = "Cell"
+
+
+class CreateContactRequest(BaseModel):
+    company_id: int
+    first_name: str
+    last_name: str
+    phone: str
+    email: Optional[str] = None
+    phone_type: str = "Cell"
+
+
+class AssignExtensionRequest(BaseModel):
+    extension: str
+    first_name: str
+    last_name: str
+    member_identifier: Optional[str] = None
+
+
+class CreateCompanyRequest(BaseModel):
+    name: str
+    address: str
+    address2: str = ""
+    city: str
+    state: str
+    zip_code: str
+    company_phone: str
+    territory: str = "Main"
+    first_name: str
+    last_name: str
+    email: str
+    phone: str
+
+
+class CreateTicketRequest(BaseModel):
+    company_id: int
+    contact_id: int
+    summary: str
+    description: str
+    board: str
+    priority: str
 
 
 @app.post("/api/contacts/{contact_id}/add-phone")
 async def api_add_phone_to_contact(
     contact_id: int,
-    phone: str = Form(...),
-    phone_type: str = Form("Cell")
+    payload: AddPhoneRequest
 ):
     """Add a phone number to an existing contact"""
-    success = await add_phone_to_contact(contact_id, phone, phone_type)
+    phone, phone_type = payload.phone, payload.phone_type
+    normalized = normalize_phone(phone)
     
-    if success:
-        # Add to cache
-        normalized = normalize_phone(phone)
-        # Get contact details for cache
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            from connectwise_api import get_cw_headers
-            url = f"{CW_BASE_URL}/company/contacts/{contact_id}"
-            resp = await client.get(url, headers=get_cw_headers())
-            
-            if resp.status_code == 200:
-                contact = resp.json()
-                company = contact.get("company", {})
-                
-                cache.add_or_update(
-                    phone_number=phone,
-                    normalized_phone=normalized,
-                    company_id=company.get("id"),
-                    company_name=company.get("name"),
-                    contact_id=contact_id,
-                    contact_name=f"{contact.get('firstName', '')} {contact.get('lastName', '')}".strip(),
-                    contact_type=phone_type
-                )
+    # Skips the PATCH when ConnectWise already has this number on the contact
+    contact = await add_phone_to_contact(contact_id, phone, phone_type)
+    
+    if contact:
+        # Add to cache; the contact response already carries its name and company
+        company = contact.get("company") or {}
+        company_id = company.get("id")
+        
+        # A contact without a company can't be cached (nor shown on a company page)
+        if company_id is not None:
+            invalidate_company_bundle(company_id)  # the ticket form lists the company's contacts
+            cache.add_or_update(
+                phone_number=phone,
+                normalized_phone=normalized,
+                company_id=company_id,
+                company_name=company.get("name") or "Unknown",
+                contact_id=contact_id,
+                contact_name=f"{contact.get('firstName', '')} {contact.get('lastName', '')}".strip(),
+                contact_type=phone_type
+            )
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "success": True,
             "message": f"Phone {phone} added to contact"
         })
     else:
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "success": False,
             "message": "Failed to add phone to contact"
         }, status_code=500)
 
 
 @app.post("/api/contacts/create")
-async def api_create_contact(
-    company_id: int = Form(...),
-    first_name: str = Form(...),
-    last_name: str = Form(...),
-    phone: str = Form(...),
-    email: Optional[str] = Form(None),
-    phone_type: str = Form("Cell")
-):
+async def api_create_contact(payload: CreateContactRequest):
     """Create a new contact with phone number"""
-    contact_id = await create_contact_with_phone(
-        company_id=company_id,
-        first_name=first_name,
-        last_name=last_name,
-        phone_number=phone,
-        email=email,
-        phone_type=phone_type
+    company_id, first_name, last_name = payload.company_id, payload.first_name, payload.last_name
+    phone, phone_type = payload.phone, payload.phone_type
+    # The company name is only needed for the cache entry, so fetch it alongside the create
+    contact_id, company = await asyncio.gather(
+        create_contact_with_phone(
+            company_id=company_id,
+            first_name=first_name,
+            last_name=last_name,
+            phone_number=phone,
+            email=payload.email,
+            phone_type=phone_type
+        ),
+        get_company_by_id(company_id)
     )
     
     if contact_id:
+        invalidate_company_bundle(company_id)  # the ticket form lists the company's contacts
+
         # Add to cache
         normalized = normalize_phone(phone)
-        company = await get_company_by_id(company_id)
         
         cache.add_or_update(
             phone_number=phone,
             normalized_phone=normalized,
             company_id=company_id,
-            company_name=company.get("name", "Unknown"),
+            company_name=(company or {}).get("name", "Unknown"),
             contact_id=contact_id,
             contact_name=f"{first_name} {last_name}",
             contact_type=phone_type
         )
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "success": True,
             "contact_id": contact_id,
             "message": f"Contact created successfully"
         })
     else:
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "success": False,
             "message": "Failed to create contact"
         }, status_code=500)
 
 
 @app.post("/api/extensions/assign")
-async def api_assign_extension(
-    extension: str = Form(...),
-    first_name: str = Form(...),
-    last_name: str = Form(...),
-    member_identifier: Optional[str] = Form(None)
-):
+async def api_assign_extension(payload: AssignExtensionRequest):
     """Assign an extension to a technician"""
-    print(f"\n📝 Extension Assignment Request:")
-    print(f"   Extension: {extension}")
-    print(f"   First Name: {first_name}")
-    print(f"   Last Name: {last_name}")
-    print(f"   Member Identifier: {member_identifier}")
+    extension, first_name, last_name = payload.extension, payload.first_name, payload.last_name
+    member_identifier = payload.member_identifier
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(
+            "\n📝 Extension Assignment Request:\n   Extension: %s\n   First Name: %s\n   Last Name: %s\n   Member Identifier: %s",
+            extension, first_name, last_name, member_identifier
+        )
 
     try:
-        extension_assignments.assign_extension(
+        await db_write(
+            extension_assignments.assign_extension,
             extension=extension,
             first_name=first_name,
             last_name=last_name,
             member_identifier=member_identifier
         )
 
-        print(f"✅ Successfully assigned extension {extension} to {first_name} {last_name}")
+        log.info("✅ Assigned extension %s to %s %s", extension, first_name, last_name)
 
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "success": True,
             "message": f"Extension {extension} assigned to {first_name} {last_name}"
         })
     except Exception as e:
-        print(f"❌ Error assigning extension: {str(e)}")
-        return JSONResponse(content={
+        log.error("❌ Error assigning extension: %s", e)
+        return ORJSONResponse(content={
             "success": False,
             "message": f"Failed to assign extension: {str(e)}"
         }, status_code=500)
 
 
 @app.post("/api/companies/create")
-async def api_create_company(
-    name: str = Form(...),
-    address: str = Form(...),
-    address2: str = Form(""),
-    city: str = Form(...),
-    state: str = Form(...),
-    zip_code: str = Form(...),
-    company_phone: str = Form(...),
-    territory: str = Form("Main"),
-    first_name: str = Form(...),
-    last_name: str = Form(...),
-    email: str = Form(...),
-    phone: str = Form(...)
-):
+async def api_create_company(payload: CreateCompanyRequest):
     """Create a new company with initial contact"""
+    name, first_name, last_name, phone = payload.name, payload.first_name, payload.last_name, payload.phone
     company_id, contact_id = await create_company_and_contact(
         name=name,
-        address=address,
-        address2=address2,
-        city=city,
-        state=state,
-        zip_code=zip_code,
-        company_phone=company_phone,
-        territory=territory,
+        address=payload.address,
+        address2=payload.address2,
+        city=payload.city,
+        state=payload.state,
+        zip_code=payload.zip_code,
+        company_phone=payload.company_phone,
+        territory=payload.territory,
         first_name=first_name,
         last_name=last_name,
-        email=email,
+        email=payload.email,
         phone=phone
     )
     
@@ -772,66 +979,123 @@ async def api_create_company(
             contact_type="Cell"
         )
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "success": True,
             "company_id": company_id,
             "contact_id": contact_id,
             "message": f"Company and contact created successfully"
         })
     else:
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "success": False,
             "message": "Failed to create company and contact"
         }, status_code=500)
 
 
 @app.post("/api/tickets/create")
-async def api_create_ticket(
-    company_id: int = Form(...),
-    contact_id: int = Form(...),
-    summary: str = Form(...),
-    description: str = Form(...),
-    board: str = Form(...),
-    priority: str = Form(...)
-):
+async def api_create_ticket(payload: CreateTicketRequest):
     """Create a new service ticket"""
+    company_id = payload.company_id
     try:
         ticket_id = await create_ticket(
             company_id=company_id,
-            contact_id=contact_id,
-            summary=summary,
-            description=description,
-            board_name=board,
-            priority_name=priority,
+            contact_id=payload.contact_id,
+            summary=payload.summary,
+            description=payload.description,
+            board_name=payload.board,
+            priority_name=payload.priority,
             status_name="New (email)"
         )
 
         if ticket_id:
-            return JSONResponse(content={
+            # The new ticket may be assigned to anyone, so drop all cached technician pages
+            _technician_page_cache.clear()
+            invalidate_company_bundle(company_id)
+            return ORJSONResponse(content={
                 "success": True,
                 "ticket_id": ticket_id,
                 "message": f"Ticket #{ticket_id} created successfully"
             })
         else:
-            return JSONResponse(content={
+            return ORJSONResponse(content={
                 "success": False,
                 "message": "Failed to create ticket"
             }, status_code=500)
 
     except Exception as e:
-        print(f"Error in api_create_ticket: {str(e)}")
-        return JSONResponse(content={
+        log.error("Error in api_create_ticket: %s", e)
+        return ORJSONResponse(content={
             "success": False,
             "message": str(e)
         }, status_code=500)
 
 
+# Company bundles by id as (fetched_at, bundle). A repeat pop within the fresh window is served as-is;
+# after that, and until the entry expires, it is still served at once while a background fetch refreshes it.
+COMPANY_BUNDLE_FRESH_SECONDS = 30
+_company_bundles = TTLCache(maxsize=256, ttl=600)
+_company_bundle_refreshes: Dict[int, asyncio.Task] = {}
+# Bumped by every invalidation, so a fetch that started before it can't store (or be shared) afterwards
+_company_bundle_generations: Dict[int, int] = {}
+
+
+def invalidate_company_bundle(company_id: int):
+    """Drop a company's bundle after a change made through this app (e.g. a new contact or ticket)"""
+    _company_bundle_generations[company_id] = _company_bundle_generations.get(company_id, 0) + 1
+    _company_bundles.pop(company_id, None)
+
+
+@single_flight
+async def _fetch_company_bundle(company_id: int, generation: int) -> Dict:
+    bundle = await get_company_bundle(company_id)
+    # Only keep it if the company wasn't invalidated while ConnectWise was answering
+    if bundle["company"] and _company_bundle_generations.get(company_id, 0) == generation:
+        _company_bundles[company_id] = (asyncio.get_running_loop().time(), bundle)
+    return bundle
+
+
+async def _refresh_company_bundle(company_id: int):
+    try:
+        await _fetch_company_bundle(company_id, _company_bundle_generations.get(company_id, 0))
+    except Exception as e:
+        log.warning("⚠️  Background refresh of company %s failed: %s", company_id, e)
+
+
+async def company_bundle(company_id: int) -> Dict:
+    """Company details, contacts and open tickets, served stale-while-revalidate"""
+    entry = _company_bundles.get(company_id)
+    if entry is None:
+        return await _fetch_company_bundle(company_id, _company_bundle_generations.get(company_id, 0))
+
+    fetched_at, bundle = entry
+    age = asyncio.get_running_loop().time() - fetched_at
+    if age > COMPANY_BUNDLE_FRESH_SECONDS and company_id not in _company_bundle_refreshes:
+        task = _company_bundle_refreshes[company_id] = asyncio.create_task(_refresh_company_bundle(company_id))
+        task.add_done_callback(lambda _: _company_bundle_refreshes.pop(company_id, None))
+    return bundle
+
+
+def revalidated_html(request: Request, content) -> Response:
+    """
+    200 HTML response tagged with a hash of its body
+    Browsers revalidate on every use, and a matching If-None-Match gets an empty 304 instead of the page.
+    """
+    body = content if isinstance(content, bytes) else content.encode("utf-8")
+    # Weak, since GZipMiddleware may send the same page under a different encoding
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=body, headers=headers)
+
+
 @app.get("/company/{company_id}", response_class=HTMLResponse)
-async def company_info(company_id: int):
+async def company_info(company_id: int, request: Request):
     """Display company information with recent tickets"""
     try:
-        # Get company details
-        company = await get_company_by_id(company_id)
+        # Get company details, contacts (for ticket creation form) and open tickets together
+        bundle = await company_bundle(company_id)
+        company = bundle["company"]
         if not company:
             return HTMLResponse(
                 content=error_page(
@@ -842,401 +1106,36 @@ async def company_info(company_id: int):
                 status_code=404
             )
 
-        # Get company contacts for ticket creation form
-        contacts = await get_company_contacts(company_id)
-
-        # Get company tickets
-        tickets = await get_company_tickets(company_id, status_filter="open", limit=25)
-
-        # Build ticket rows HTML
-        ticket_rows = ""
-        if tickets:
-            for ticket in tickets:
-                ticket_id = ticket.get("id", "N/A")
-                summary = ticket.get("summary", "No summary")
-                status = ticket.get("status", {}).get("name", "Unknown")
-                priority = ticket.get("priority", {}).get("name", "Normal")
-                board = ticket.get("board", {}).get("name", "Unknown")
-
-                # Get assigned contact/resource
-                contact_name = ticket.get("contact", {}).get("name", "N/A") if ticket.get("contact") else "N/A"
-
-                # Priority badge color mapping
-                priority_color = {
-                    "Priority 1 - Emergency Response": "#dc2626",  # Red
-                    "Priority 2 - Quick Response": "#ea580c",      # Orange
-                    "Priority 3 - Normal Response": "#eab308",     # Yellow
-                    "Priority 4 - Schedule Maintenance": "#3b82f6", # Blue
-                    "Priority 5 - Next Time": "#10b981",           # Green
-                    "Do Not Respond": "#9333ea"                    # Purple
-                }.get(priority, "#eab308")
-
-                # Status color
-                status_color = "#10b981" if "new" in status.lower() else "#58595a"
-
-                ticket_rows += f"""
-                <tr style="border-bottom: 1px solid #e5e7eb;">
-                    <td style="padding: 12px; text-align: left;">
-                        <a href="https://app.nilear.com/mtx/{ticket_id}"
-                           onclick="openTicketPopup('https://app.nilear.com/mtx/{ticket_id}'); return false;"
-                           style="color: #01aeed; text-decoration: none; font-weight: 600; cursor: pointer;">
-                            #{ticket_id}
-                        </a>
-                    </td>
-                    <td style="padding: 12px; text-align: left;">{summary[:80]}{'...' if len(summary) > 80 else ''}</td>
-                    <td style="padding: 12px; text-align: center; white-space: nowrap;">
-                        <span style="background: {priority_color}; color: white; padding: 6px 12px; border-radius: 99px; font-size: 11px; font-weight: 600; display: inline-block; white-space: nowrap;">
-                            {priority}
-                        </span>
-                    </td>
-                    <td style="padding: 12px; text-align: center; white-space: nowrap;">
-                        <span style="background: {status_color}; color: white; padding: 6px 12px; border-radius: 99px; font-size: 11px; font-weight: 600; display: inline-block;">
-                            {status}
-                        </span>
-                    </td>
-                    <td style="padding: 12px; text-align: left;">{board}</td>
-                    <td style="padding: 12px; text-align: left;">{contact_name}</td>
-                </tr>
-                """
-        else:
-            ticket_rows = """
-            <tr>
-                <td colspan="6" style="padding: 24px; text-align: center; color: #6b7280;">
-                    No open tickets found for this company
-                </td>
-            </tr>
-            """
+        contacts = bundle["contacts"]
+        tickets = bundle["tickets"]
 
         # Company info
         company_name = company.get("name", "Unknown Company")
         company_phone = company.get("phoneNumber", "N/A")
-        company_address = company.get("addressLine1", "")
-        company_city = company.get("city", "")
-        company_state = company.get("state", "")
-        company_zip = company.get("zip", "")
-        company_status = company.get("status", {}).get("name", "Unknown")
-
-        full_address = f"{company_address}, {company_city}, {company_state} {company_zip}".strip(", ")
-
-        # Build contact options for ticket form
-        contact_options = ""
-        for contact in contacts:
-            contact_id = contact.get("id")
-            first_name = contact.get("firstName", "")
-            last_name = contact.get("lastName", "")
-            contact_name = f"{first_name} {last_name}".strip()
-            contact_options += f'<option value="{contact_id}">{contact_name}</option>'
-
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>CNS4U - {company_name}</title>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600&family=Lato:wght@700&display=swap" rel="stylesheet">
-            <style>
-                * {{
-                    margin: 0;
-                    padding: 0;
-                    box-sizing: border-box;
-                }}
-                body {{
-                    font-family: 'Poppins', sans-serif;
-                    background: #f4f4f4;
-                    min-height: 100vh;
-                    padding: 0;
-                }}
-                .logo-header {{
-                    background: #545454;
-                    padding: 15px 30px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                .logo {{
-                    max-width: 250px;
-                    height: auto;
-                }}
-                .container {{
-                    max-width: 1200px;
-                    margin: 0 auto;
-                    background: white;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-                }}
-                .header {{
-                    background: #01aeed;
-                    color: white;
-                    padding: 30px;
-                    border-bottom: 4px solid #dd2b28;
-                }}
-                .header h1 {{
-                    font-size: 28px;
-                    margin-bottom: 10px;
-                    font-family: 'Lato', sans-serif;
-                    font-weight: 700;
-                }}
-                .company-info {{
-                    padding: 20px 30px;
-                    background: #f9fafb;
-                    border-bottom: 1px solid #e5e7eb;
-                }}
-                .info-grid {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                    gap: 15px;
-                    margin-top: 15px;
-                }}
-                .info-item {{
-                    display: flex;
-                    align-items: center;
-                    gap: 10px;
-                }}
-                .info-label {{
-                    font-weight: 600;
-                    color: #333333;
-                }}
-                .info-value {{
-                    color: #58595a;
-                }}
-                .content {{
-                    padding: 30px;
-                }}
-                .section-title {{
-                    font-size: 20px;
-                    font-weight: 700;
-                    font-family: 'Lato', sans-serif;
-                    color: #333333;
-                    margin-bottom: 20px;
-                    padding-bottom: 10px;
-                    border-bottom: 3px solid #01aeed;
-                }}
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    background: white;
-                }}
-                th {{
-                    background: #f1f1f1;
-                    padding: 12px;
-                    text-align: left;
-                    font-weight: 700;
-                    font-family: 'Lato', sans-serif;
-                    color: #333333;
-                    border-bottom: 2px solid #01aeed;
-                }}
-                .actions {{
-                    margin-top: 30px;
-                    padding-top: 20px;
-                    border-top: 1px solid #e5e7eb;
-                    display: flex;
-                    gap: 15px;
-                    flex-wrap: wrap;
-                }}
-                .btn {{
-                    padding: 12px 24px;
-                    border-radius: 99px;
-                    text-decoration: none;
-                    font-weight: 600;
-                    display: inline-block;
-                    transition: all 0.3s;
-                }}
-                .btn-primary {{
-                    background: #01aeed;
-                    color: white;
-                }}
-                .btn-primary:hover {{
-                    background: #dd2b28;
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 12px rgba(1, 174, 237, 0.3);
-                }}
-                .btn-secondary {{
-                    background: #58595a;
-                    color: white;
-                }}
-                .btn-secondary:hover {{
-                    background: #333333;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="logo-header">
-                <img src="/static/logo-darkbg.png" alt="CNS4U Logo" class="logo" onerror="this.style.display='none'">
-            </div>
-            <div class="container">
-                <div class="header">
-                    <h1>{company_name}</h1>
-                    <p>ConnectWise ID: {company_id} | Status: {company_status}</p>
-                </div>
-
-                <div class="company-info">
-                    <div class="info-grid">
-                        <div class="info-item">
-                            <span class="info-label">Phone:</span>
-                            <span class="info-value">{company_phone}</span>
-                        </div>
-                        <div class="info-item">
-                            <span class="info-label">Address:</span>
-                            <span class="info-value">{full_address or 'N/A'}</span>
-                        </div>
-                    </div>
-                </div>
-
-                <div class="content">
-                    <h2 class="section-title">Open Tickets ({len(tickets)})</h2>
-                    <table>
-                        <thead>
-                            <tr>
-                                <th>Ticket #</th>
-                                <th>Summary</th>
-                                <th style="text-align: center;">Priority</th>
-                                <th style="text-align: center;">Status</th>
-                                <th>Board</th>
-                                <th>Contact</th>
-                            </tr>
-                        </thead>
-                        <tbody>
-                            {ticket_rows}
-                        </tbody>
-                    </table>
-
-                    <div class="actions">
-                        <button onclick="showTicketForm()" class="btn btn-primary">
-                            Create Ticket
-                        </button>
-                        <a href="https://app.nilear.com/mtx" target="_blank" class="btn btn-secondary">
-                            Open Nilear
-                        </a>
-                        <a href="/" class="btn btn-secondary">
-                            Back to Home
-                        </a>
-                    </div>
-
-                    <!-- Create Ticket Form (Hidden by default) -->
-                    <div id="ticket-form" style="display: none; margin-top: 30px; padding: 30px; background: #f9fafb; border-radius: 8px; border: 2px solid #01aeed;">
-                        <h3 style="color: #333333; font-family: 'Lato', sans-serif; margin-top: 0;">Create New Ticket</h3>
-                        <form id="create-ticket-form" onsubmit="submitTicket(event)">
-                            <input type="hidden" name="company_id" value="{company_id}">
-
-                            <div style="margin-bottom: 20px;">
-                                <label style="display: block; margin-bottom: 8px; font-weight: 600; color: #333333;">Contact</label>
-                                <select name="contact_id" required style="width: 100%; padding: 10px; border: 1px solid #e5e7eb; border-radius: 6px; font-family: 'Poppins', sans-serif;">
-                                    <option value="">Select a contact...</option>
-                                    {contact_options}
-                                </select>
-                            </div>
-
-                            <div style="margin-bottom: 20px;">
-                                <label style="display: block; margin-bottom: 8px; font-weight: 600; color: #333333;">Summary</label>
-                                <input type="text" name="summary" required style="width: 100%; padding: 10px; border: 1px solid #e5e7eb; border-radius: 6px; font-family: 'Poppins', sans-serif;">
-                            </div>
-
-                            <div style="margin-bottom: 20px;">
-                                <label style="display: block; margin-bottom: 8px; font-weight: 600; color: #333333;">Description</label>
-                                <textarea name="description" rows="4" required style="width: 100%; padding: 10px; border: 1px solid #e5e7eb; border-radius: 6px; font-family: 'Poppins', sans-serif; resize: vertical;"></textarea>
-                            </div>
-
-                            <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 20px; margin-bottom: 20px;">
-                                <div>
-                                    <label style="display: block; margin-bottom: 8px; font-weight: 600; color: #333333;">Board</label>
-                                    <select name="board" required style="width: 100%; padding: 10px; border: 1px solid #e5e7eb; border-radius: 6px; font-family: 'Poppins', sans-serif;">
-                                        <option value="San Jose Professional Services">San Jose Professional Services</option>
-                                        <option value="Hollister Professional Services">Hollister Professional Services</option>
-                                    </select>
-                                </div>
-
-                                <div>
-                                    <label style="display: block; margin-bottom: 8px; font-weight: 600; color: #333333;">Priority</label>
-                                    <select name="priority" required style="width: 100%; padding: 10px; border: 1px solid #e5e7eb; border-radius: 6px; font-family: 'Poppins', sans-serif;">
-                                        <option value="Priority 1 - Emergency Response" style="color: #dc2626;">🔴 Priority 1 - Emergency Response</option>
-                                        <option value="Priority 2 - Quick Response" style="color: #ea580c;">🟠 Priority 2 - Quick Response</option>
-                                        <option value="Priority 3 - Normal Response" selected style="color: #eab308;">🟡 Priority 3 - Normal Response</option>
-                                        <option value="Priority 4 - Schedule Maintenance" style="color: #3b82f6;">🔵 Priority 4 - Schedule Maintenance</option>
-                                        <option value="Priority 5 - Next Time" style="color: #10b981;">🟢 Priority 5 - Next Time</option>
-                                        <option value="Do Not Respond" style="color: #9333ea;">🟣 Do Not Respond</option>
-                                    </select>
-                                </div>
-                            </div>
-
-                            <div style="display: flex; gap: 15px;">
-                                <button type="submit" class="btn btn-primary">Create Ticket</button>
-                                <button type="button" onclick="hideTicketForm()" class="btn btn-secondary">Cancel</button>
-                            </div>
-                        </form>
-                        <div id="ticket-message" style="margin-top: 20px;"></div>
-                    </div>
-                </div>
-            </div>
+        company_address = company.get("addressLine1") or ""
+        company_city = company.get("city") or ""
+        company_state = company.get("state") or ""
+        company_zip = company.get("zip") or ""
+        company_status = ref_name(company, "status")
 
-            <script>
-                function showTicketForm() {{
-                    document.getElementById('ticket-form').style.display = 'block';
-                    document.getElementById('ticket-form').scrollIntoView({{ behavior: 'smooth' }});
-                }}
-
-                function hideTicketForm() {{
-                    document.getElementById('ticket-form').style.display = 'none';
-                    document.getElementById('create-ticket-form').reset();
-                    document.getElementById('ticket-message').innerHTML = '';
-                }}
-
-                async function submitTicket(event) {{
-                    event.preventDefault();
-                    const form = event.target;
-                    const formData = new FormData(form);
-                    const messageDiv = document.getElementById('ticket-message');
-
-                    messageDiv.innerHTML = '<p style="color: #01aeed;">Creating ticket...</p>';
-
-                    try {{
-                        const response = await fetch('/api/tickets/create', {{
-                            method: 'POST',
-                            body: formData
-                        }});
-
-                        const result = await response.json();
-
-                        if (result.success) {{
-                            messageDiv.innerHTML = `<p style="color: #6bb545; font-weight: 600;">✓ ${{result.message}} - Refreshing...</p>`;
-                            // Reload immediately to show the new ticket in the list
-                            setTimeout(() => {{
-                                window.location.reload(true);
-                            }}, 500);
-                        }} else {{
-                            messageDiv.innerHTML = `<p style="color: #dd2b28; font-weight: 600;">✗ ${{result.message}}</p>`;
-                        }}
-                    }} catch (error) {{
-                        messageDiv.innerHTML = `<p style="color: #dd2b28; font-weight: 600;">✗ Error: ${{error.message}}</p>`;
-                    }}
-                }}
-
-                function openTicketPopup(url) {{
-                    // Calculate centered position
-                    const width = Math.min(1400, window.screen.width * 0.9);
-                    const height = Math.min(900, window.screen.height * 0.9);
-                    const left = (window.screen.width - width) / 2;
-                    const top = (window.screen.height - height) / 2;
-
-                    // Open popup window with specific features
-                    // This shares the browser session unlike iframe
-                    const popup = window.open(
-                        url,
-                        'TicketDetails',
-                        `width=${{width}},height=${{height}},left=${{left}},top=${{top}},resizable=yes,scrollbars=yes,status=yes,toolbar=no,menubar=no,location=no`
-                    );
-
-                    // Focus the popup window
-                    if (popup) {{
-                        popup.focus();
-                    }}
-                }}
-            </script>
-        </body>
-        </html>
-        """
+        # Join only the parts that are present, so missing fields don't leave stray commas
+        address_parts = (company_address.strip(), company_city.strip(), f"{company_state} {company_zip}".strip())
+        full_address = ", ".join(part for part in address_parts if part)
 
-        return HTMLResponse(content=html_content)
+        return revalidated_html(request, COMPANY_INFO_TEMPLATE.render(
+            company_id=company_id,
+            company_name=company_name,
+            company_phone=company_phone,
+            company_status=company_status,
+            full_address=full_address,
+            tickets=tickets,
+            contact_options=contact_options_html(
+                tuple((c.get("id"), c.get("firstName", ""), c.get("lastName", "")) for c in contacts)
+            ),
+        ))
 
     except Exception as e:
-        print(f"Error in company_info: {str(e)}")
+        log.error("Error in company_info: %s", e)
         return HTMLResponse(
             content=error_page(
                 "Error Loading Company",
@@ -1247,6 +1146,23 @@ async def company_info(company_id: int):
         )
 
 
+async def get_unassigned_members() -> List[Dict]:
+    """Active ConnectWise members with a full name not yet tied to any extension"""
+    all_members = await get_all_members()
+    # Hardcoded and database-assigned names
+    assigned_names = extension_resolver.assigned_names()
+
+    unassigned = []
+    for m in all_members:
+        if m.get('inactiveFlag'):
+            continue
+        name = (m.get('firstName'), m.get('lastName'))
+        # Must have both names, and not already be assigned
+        if name[0] and name[1] and name not in assigned_names:
+            unassigned.append(m)
+    return unassigned
+
+
 @app.get("/screenpop")
 async def screenpop(
     request: Request,
@@ -1266,33 +1182,23 @@ async def screenpop(
             status_code=400
         )
 
-    print(f"\n{'='*60}")
-    print(f"📞 Screenpop for: {phone_number}")
-    print(f"{'='*60}\n")
+    log.info("\n%s\n📞 Screenpop for: %s\n%s\n", "=" * 60, phone_number, "=" * 60)
 
     # Check if this is a 4-digit internal extension
     is_internal_extension = phone_number.isdigit() and len(phone_number) == 4
 
     if is_internal_extension:
-        # Check database first, then fall back to hardcoded INTERNAL_EXTENSIONS
-        db_assignment = extension_assignments.get_assignment(phone_number)
+        # Database assignments first, then hardcoded INTERNAL_EXTENSIONS, in one lookup
+        resolved = extension_resolver.resolve(phone_number)
 
-        if db_assignment or phone_number in INTERNAL_EXTENSIONS:
+        if resolved:
             # Known extension (from database or hardcoded)
-            if db_assignment:
-                first_name = db_assignment['first_name']
-                last_name = db_assignment['last_name']
-                print(f"🔧 Internal extension detected (from database): {first_name} {last_name}")
-            else:
-                first_name, last_name = INTERNAL_EXTENSIONS[phone_number]
-                print(f"🔧 Internal extension detected (hardcoded): {first_name} {last_name}")
+            first_name, last_name, cw_first, cw_last, is_override, source = resolved
+            log.info("🔧 Internal extension detected (%s): %s %s", source, first_name, last_name)
 
-            # Check if there's a ConnectWise name override
-            if phone_number in CONNECTWISE_NAME_OVERRIDES:
-                cw_first, cw_last = CONNECTWISE_NAME_OVERRIDES[phone_number]
-                print(f"   Using ConnectWise override: {cw_first} {cw_last}")
-            else:
-                cw_first, cw_last = first_name, last_name
+            # Report a ConnectWise name override
+            if is_override:
+                log.info("   Using ConnectWise override: %s %s", cw_first, cw_last)
 
             # Get member info from ConnectWise
             member = await get_member_by_name(cw_first, cw_last)
@@ -1302,25 +1208,14 @@ async def screenpop(
                 member_identifier = member["identifier"]
                 full_name = f"{first_name} {last_name}"
 
-                print(f"✅ Found member: {full_name} (ID: {member_id}, Identifier: {member_identifier})")
+                log.info("✅ Found member: %s (ID: %s, Identifier: %s)", full_name, member_id, member_identifier)
 
                 # Redirect to technician tickets page
                 return RedirectResponse(url=f"/technician/{member_identifier}?name={full_name}")
             else:
-                print(f"❌ Member not found in ConnectWise: {cw_first} {cw_last}")
+                log.warning("❌ Member not found in ConnectWise: %s %s", cw_first, cw_last)
                 # Get unassigned technicians for error page
-                from connectwise_api import get_all_members
-                all_members = await get_all_members()
-                # Combine hardcoded and database-assigned names
-                assigned_names = set(INTERNAL_EXTENSIONS.values()) | extension_assignments.get_assigned_names()
-                # Filter out inactive members, assigned members, and those with missing names
-                unassigned = [
-                    m for m in all_members
-                    if (m.get('firstName'), m.get('lastName')) not in assigned_names
-                    and not m.get('inactiveFlag', False)
-                    and m.get('firstName')  # Must have first name
-                    and m.get('lastName')   # Must have last name
-                ]
+                unassigned = await get_unassigned_members()
 
                 return HTMLResponse(
                     content=unassigned_technicians_error_page(
@@ -1332,19 +1227,8 @@ async def screenpop(
                 )
         else:
             # Unknown extension - show list of unassigned technicians
-            print(f"🔧 Unknown internal extension: {phone_number}")
-            from connectwise_api import get_all_members
-            all_members = await get_all_members()
-            # Combine hardcoded and database-assigned names
-            assigned_names = set(INTERNAL_EXTENSIONS.values()) | extension_assignments.get_assigned_names()
-            # Filter out inactive members, assigned members, and those with missing names
-            unassigned = [
-                m for m in all_members
-                if (m.get('firstName'), m.get('lastName')) not in assigned_names
-                and not m.get('inactiveFlag', False)
-                and m.get('firstName')  # Must have first name
-                and m.get('lastName')   # Must have last name
-            ]
+            log.info("🔧 Unknown internal extension: %s", phone_number)
+            unassigned = await get_unassigned_members()
 
             return HTMLResponse(
                 content=unassigned_technicians_error_page(
@@ -1358,60 +1242,55 @@ async def screenpop(
     normalized = normalize_phone(phone_number)
     
     # Check cache
-    cached_results = cache.lookup(normalized)
+    cached_results = await cache.lookup(normalized)
     
     if not cached_results:
-        print(f"❌ No cached results for {phone_number}")
-        return HTMLResponse(
-            content=not_found_page(phone_number, normalized),
-            status_code=404
-        )
+        log.info("❌ No cached results for %s", phone_number)
+        return not_found_response(request, phone_number, normalized)
     
     # If single match, redirect directly
     if len(cached_results) == 1:
         result = cached_results[0]
-        company_id = result["company_id"]
+        company_id = result.company_id
         company_url = f"/company/{company_id}"
 
-        print(f"✅ Single match - redirecting to: {company_url}")
-        print(f"   Company: {result['company_name']}")
-        print(f"   Contact: {result['contact_name']}\n")
+        log.info("✅ Single match - redirecting to: %s", company_url)
+        log.debug("   Company: %s\n   Contact: %s\n", result.company_name, result.contact_name)
 
         return RedirectResponse(url=company_url)
 
-    # Multiple matches - check if they're all from the same company
-    unique_companies = set(r["company_id"] for r in cached_results)
+    # Multiple matches - check if they're all from the same company (stops at the first other one)
+    first_company_id = cached_results[0].company_id
+    multi_company = any(r.company_id != first_company_id for r in cached_results)
 
-    if len(unique_companies) == 1:
+    if not multi_company:
         # All contacts are from the same company
-        company_id = cached_results[0]["company_id"]
-        company_name = cached_results[0]["company_name"]
-        print(f"⚠️  Multiple contacts ({len(cached_results)}) at same company - showing contact selection\n")
-        print(f"   Company: {company_name}\n")
-        return HTMLResponse(
-            content=contact_selection_page(phone_number, company_id, company_name, cached_results),
-            status_code=200
+        company_id = cached_results[0].company_id
+        company_name = cached_results[0].company_name
+        log.info("⚠️  Multiple contacts (%d) at same company - showing contact selection", len(cached_results))
+        log.debug("   Company: %s\n", company_name)
+        return revalidated_html(
+            request, contact_selection_page(phone_number, company_id, company_name, cached_results)
         )
 
     # Multiple companies - show company selection page
-    print(f"⚠️  Multiple companies ({len(unique_companies)}) - showing company selection page\n")
-    return HTMLResponse(
-        content=selection_page(phone_number, cached_results),
-        status_code=200
-    )
+    if log.isEnabledFor(logging.INFO):
+        company_count = len({r.company_id for r in cached_results})
+        log.info("⚠️  Multiple companies (%d) - showing company selection page\n", company_count)
+    return revalidated_html(request, selection_page(phone_number, cached_results))
 
 
 @app.get("/select-company/{company_id}")
-async def select_company(company_id: int, phone: str = Query(...)):
+async def select_company(company_id: int, request: Request, phone: str = Query(...)):
     """
     Intermediate endpoint when selecting a company from multiple companies.
     Checks if the company has multiple contacts for this phone number.
     """
     normalized = normalize_phone(phone)
-    cached_results = cache.lookup(normalized)
+    cached_results = await cache.lookup(normalized)
 
     # Filter results for the selected company
-    company_contacts = [r for r in cached_results if r["company_id"] == company_id]
+    company_contacts = [r for r in cached_results if r.company_id == company_id]
 
     if not company_contacts:
         return HTMLResponse(
@@ -1423,23 +1302,24 @@ async def select_company(company_id: int, phone: str = Query(...)):
             status_code=404
         )
 
-    company_name = company_contacts[0]["company_name"]
+    company_name = company_contacts[0].company_name
 
     # If single contact for this company, redirect to company page
     if len(company_contacts) == 1:
-        print(f"✅ Single contact for company {company_id} - redirecting to company page")
+        log.info("✅ Single contact for company %s - redirecting to company page", company_id)
         return RedirectResponse(url=f"/company/{company_id}")
 
     # Multiple contacts for this company - show contact selection
-    print(f"⚠️  Multiple contacts ({len(company_contacts)}) for company {company_id} - showing contact selection")
-    return HTMLResponse(
-        content=contact_selection_page(phone, company_id, company_name, company_contacts),
-        status_code=200
-    )
+    log.info("⚠️  Multiple contacts (%d) for company %s - showing contact selection", len(company_contacts), company_id)
+    return revalidated_html(request, contact_selection_page(phone, company_id, company_name, company_contacts))
+
+
+# Rendered technician pages, keyed by member, display name and (ticket id, lastUpdated) pairs
+_technician_page_cache = TTLCache(maxsize=256, ttl=30)
 
 
 @app.get("/technician/{member_identifier}")
-async def technician_tickets(member_identifier: str, name: str = Query(...)):
+async def technician_tickets(member_identifier: str, request: Request, name: str = Query(...)):
     """
     Display assigned tickets for a technician/member
     """
@@ -1447,13 +1327,38 @@ async def technician_tickets(member_identifier: str, name: str = Query(...)):
         # Get tickets assigned to this technician
         tickets = await get_member_tickets(member_identifier, status_filter="open", limit=50)
 
-        return HTMLResponse(
-            content=technician_tickets_page(member_identifier, name, tickets),
-            status_code=200
+        # Reuse the page while the same tickets are open and unchanged
+        key = (
+            member_identifier,
+            name,
+            tuple((t.get("id"), t.get("_info", {}).get("lastUpdated")) for t in tickets)
         )
+        html_content = _technician_page_cache.get(key)
+        if html_content is not None:
+            return revalidated_html(request, html_content)
+
+        # The first chunk renders here, so an error before any output still gets the error page below
+        page = iter_technician_tickets_page(member_identifier, name, tickets)
+        first_chunk = next(page, "")
+
+        async def stream_page():
+            # Send rows as they render, then keep the whole page for the next hit
+            chunks = [first_chunk]
+            yield first_chunk
+            try:
+                for chunk in page:
+                    chunks.append(chunk)
+                    yield chunk
+            except Exception as e:
+                # The 200 has already gone out; end the page early and leave it uncached
+                log.error("Error rendering technician page for %s: %s", member_identifier, e)
+                return
+            _technician_page_cache[key] = "".join(chunks).encode("utf-8")
+
+        return StreamingResponse(stream_page(), media_type="text/html")
 
     except Exception as e:
-        print(f"Error in technician_tickets: {str(e)}")
+        log.error("Error in technician_tickets: %s", e)
         return HTMLResponse(
             content=error_page(
                 "Error Loading Tickets",
@@ -1465,1622 +1370,186 @@ async def technician_tickets(member_identifier: str, name: str = Query(...)):
 
 
 # HTML page generators
+# Cached pages are kept UTF-8 encoded, so a cache hit goes out without re-encoding the body
 
-def contact_selection_page(phone_number: str, company_id: int, company_name: str, contacts: List[Dict]) -> str:
+def contact_selection_page(phone_number: str, company_id: int, company_name: str, contacts: List[CacheHit]) -> bytes:
     """Generate selection page for multiple contacts at the same company"""
+    return _contact_selection_page(phone_number, company_id, company_name, tuple(contacts))
 
-    # Generate contact rows
-    contact_rows = ""
-    for contact in contacts:
-        contact_name = contact["contact_name"]
-        contact_type = contact["contact_type"]
-        contact_id = contact["contact_id"]
-
-        contact_rows += f"""
-        <tr style="border-bottom: 1px solid #e5e7eb;">
-            <td style="padding: 15px;">
-                <strong style="font-size: 16px;">{contact_name}</strong>
-            </td>
-            <td style="padding: 15px; color: #6b7280;">
-                {contact_type}
-            </td>
-            <td style="padding: 15px; text-align: right;">
-                <a href="/company/{company_id}" class="button">Select Contact →</a>
-            </td>
-        </tr>
-        """
-
-    return f"""
-    <html>
-        <head>
-            <title>CNS4U - Select Contact</title>
-            <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600&family=Lato:wght@700&display=swap" rel="stylesheet">
-            <style>
-                body {{
-                    font-family: 'Poppins', sans-serif;
-                    max-width: 900px;
-                    margin: 0 auto;
-                    padding: 0;
-                    background-color: #f4f4f4;
-                }}
-                .header {{
-                    background: #545454;
-                    padding: 20px 40px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                .logo {{
-                    max-width: 300px;
-                    height: auto;
-                }}
-                .container {{
-                    background: white;
-                    padding: 40px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-                }}
-                h1 {{
-                    color: #333333;
-                    font-family: 'Lato', sans-serif;
-                    font-weight: 700;
-                    margin-top: 0;
-                }}
-                .phone {{
-                    font-size: 24px;
-                    font-weight: 600;
-                    color: #01aeed;
-                    margin: 20px 0;
-                }}
-                .company-name {{
-                    font-size: 20px;
-                    color: #333333;
-                    margin: 20px 0;
-                    padding: 15px;
-                    background: #f9fafb;
-                    border-left: 4px solid #01aeed;
-                    border-radius: 4px;
-                }}
-                .info {{
-                    color: #58595a;
-                    margin: 20px 0;
-                    line-height: 1.6;
-                }}
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin-top: 30px;
-                    background: white;
-                    border: 1px solid #e5e7eb;
-                    border-radius: 8px;
-                    overflow: hidden;
-                }}
-                th {{
-                    background: #f1f1f1;
-                    padding: 15px;
-                    text-align: left;
-                    font-weight: 700;
-                    font-family: 'Lato', sans-serif;
-                    color: #333333;
-                    border-bottom: 2px solid #01aeed;
-                }}
-                tr:hover {{
-                    background: #f9fafb;
-                }}
-                .button {{
-                    display: inline-block;
-                    padding: 10px 20px;
-                    background: #01aeed;
-                    color: white;
-                    text-decoration: none;
-                    border-radius: 99px;
-                    font-weight: 600;
-                    transition: all 0.3s;
-                    white-space: nowrap;
-                }}
-                .button:hover {{
-                    background: #dd2b28;
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 12px rgba(1, 174, 237, 0.3);
-                }}
-                .actions {{
-                    margin-top: 30px;
-                    padding-top: 20px;
-                    border-top: 1px solid #e5e7eb;
-                }}
-                .btn-secondary {{
-                    display: inline-block;
-                    padding: 10px 20px;
-                    background: #58595a;
-                    color: white;
-                    text-decoration: none;
-                    border-radius: 99px;
-                    font-weight: 600;
-                    transition: all 0.3s;
-                    margin-right: 10px;
-                }}
-                .btn-secondary:hover {{
-                    background: #333333;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <img src="/static/logo-darkbg.png" alt="CNS4U Logo" class="logo" onerror="this.style.display='none'">
-            </div>
-            <div class="container">
-                <h1>Multiple Contacts Found</h1>
-                <div class="phone">{phone_number}</div>
-                <div class="company-name">
-                    <strong>Company:</strong> {company_name}
-                </div>
-                <p class="info">
-                    This phone number is associated with <strong>{len(contacts)} contacts</strong> at this company.
-                    Please select which contact this call is for:
-                </p>
-
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Contact Name</th>
-                            <th>Phone Type</th>
-                            <th style="text-align: right;">Action</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {contact_rows}
-                    </tbody>
-                </table>
-
-                <div class="actions">
-                    <button onclick="showNewContactForm()" class="button">Create New Contact</button>
-                    <a href="/company/{company_id}" class="btn-secondary">View Company Details</a>
-                    <a href="/" class="btn-secondary">Back to Home</a>
-                </div>
-
-                <!-- Create New Contact Form (Hidden by default) -->
-                <div id="new-contact-section" style="display: none; margin-top: 30px; padding: 30px; background: #f9fafb; border-radius: 8px; border: 2px solid #01aeed;">
-                    <h3 style="color: #333333; font-family: 'Lato', sans-serif; margin-top: 0;">Create New Contact</h3>
-                    <p style="color: #58595a;">Company: <strong>{company_name}</strong></p>
-
-                    <form id="new-contact-form" onsubmit="submitNewContact(event)">
-                        <input type="hidden" name="company_id" value="{company_id}">
-                        <input type="hidden" name="phone" value="{phone_number}">
-
-                        <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 15px;">
-                            <div style="margin-bottom: 15px;">
-                                <label style="display: block; margin-bottom: 8px; font-weight: 600; color: #333333;">First Name *</label>
-                                <input type="text" name="first_name" required style="width: 100%; padding: 10px; border: 1px solid #e5e7eb; border-radius: 6px; font-family: 'Poppins', sans-serif;">
-                            </div>
-                            <div style="margin-bottom: 15px;">
-                                <label style="display: block; margin-bottom: 8px; font-weight: 600; color: #333333;">Last Name *</label>
-                                <input type="text" name="last_name" required style="width: 100%; padding: 10px; border: 1px solid #e5e7eb; border-radius: 6px; font-family: 'Poppins', sans-serif;">
-                            </div>
-                        </div>
-
-                        <div style="margin-bottom: 15px;">
-                            <label style="display: block; margin-bottom: 8px; font-weight: 600; color: #333333;">Phone Number *</label>
-                            <input type="text" value="{phone_number}" readonly style="width: 100%; padding: 10px; border: 1px solid #e5e7eb; border-radius: 6px; background: #f9fafb; font-family: 'Poppins', sans-serif;">
-                        </div>
-
-                        <div style="margin-bottom: 15px;">
-                            <label style="display: block; margin-bottom: 8px; font-weight: 600; color: #333333;">Email</label>
-                            <input type="email" name="email" style="width: 100%; padding: 10px; border: 1px solid #e5e7eb; border-radius: 6px; font-family: 'Poppins', sans-serif;">
-                        </div>
-
-                        <div style="margin-bottom: 15px;">
-                            <label style="display: block; margin-bottom: 8px; font-weight: 600; color: #333333;">Phone Type</label>
-                            <select name="phone_type" style="width: 100%; padding: 10px; border: 1px solid #e5e7eb; border-radius: 6px; font-family: 'Poppins', sans-serif;">
-                                <option value="Cell">Cell</option>
-                                <option value="Direct">Direct</option>
-                                <option value="Mobile">Mobile</option>
-                                <option value="Phone">Phone</option>
-                            </select>
-                        </div>
-
-                        <div style="display: flex; gap: 15px;">
-                            <button type="submit" class="button">Create Contact</button>
-                            <button type="button" onclick="hideNewContactForm()" class="btn-secondary">Cancel</button>
-                        </div>
-                    </form>
-                    <div id="contact-message" style="margin-top: 20px;"></div>
-                </div>
-            </div>
 
-            <script>
-                function showNewContactForm() {{
-                    document.getElementById('new-contact-section').style.display = 'block';
-                    document.getElementById('new-contact-section').scrollIntoView({{ behavior: 'smooth' }});
-                }}
-
-                function hideNewContactForm() {{
-                    document.getElementById('new-contact-section').style.display = 'none';
-                    document.getElementById('new-contact-form').reset();
-                    document.getElementById('contact-message').innerHTML = '';
-                }}
-
-                async function submitNewContact(event) {{
-                    event.preventDefault();
-                    const form = event.target;
-                    const formData = new FormData(form);
-                    const messageDiv = document.getElementById('contact-message');
-
-                    messageDiv.innerHTML = '<p style="color: #01aeed;">Creating contact...</p>';
-
-                    try {{
-                        const response = await fetch('/api/contacts/create', {{
-                            method: 'POST',
-                            body: formData
-                        }});
-
-                        const result = await response.json();
-
-                        if (result.success) {{
-                            messageDiv.innerHTML = `<p style="color: #6bb545; font-weight: 600;">✓ Contact created successfully! Redirecting...</p>`;
-                            setTimeout(() => {{
-                                window.location.href = '/company/{company_id}';
-                            }}, 1500);
-                        }} else {{
-                            messageDiv.innerHTML = `<p style="color: #dd2b28; font-weight: 600;">✗ ${{result.message}}</p>`;
-                        }}
-                    }} catch (error) {{
-                        messageDiv.innerHTML = `<p style="color: #dd2b28; font-weight: 600;">✗ Error: ${{error.message}}</p>`;
-                    }}
-                }}
-            </script>
-        </body>
-    </html>
-    """
+# Cache rows are immutable tuples (last_updated included), so identical inputs give identical HTML
+@lru_cache(maxsize=256)
+def _contact_selection_page(phone_number: str, company_id: int, company_name: str,
+                            contacts: Tuple[CacheHit, ...]) -> bytes:
+    # Escape once up front; Jinja passes Markup values through untouched at each use
+    return CONTACT_SELECTION_TEMPLATE.render(
+        phone_number=escape(phone_number),
+        company_id=escape(company_id),
+        company_name=company_name,
+        contacts=contacts
+    ).encode("utf-8")
 
 
-def selection_page(phone_number: str, results: List[Dict]) -> str:
+def selection_page(phone_number: str, results: List[CacheHit]) -> bytes:
     """Generate selection page for multiple matches"""
-    
+    return _selection_page(phone_number, tuple(results))
+
+
+@lru_cache(maxsize=256)
+def _selection_page(phone_number: str, results: Tuple[CacheHit, ...]) -> bytes:
     # Group by company
     companies = {}
     for result in results:
-        company_id = result["company_id"]
-        if company_id not in companies:
-            companies[company_id] = {
-                "id": company_id,
-                "name": result["company_name"],
+        entry = companies.get(result.company_id)
+        if entry is None:
+            entry = companies[result.company_id] = {
+                "id": result.company_id,
+                "name": result.company_name,
                 "contacts": []
             }
-        companies[company_id]["contacts"].append(result)
-    
-    # Generate HTML rows
-    rows_html = ""
-    for company_id, company_data in companies.items():
-        contacts_list = "<br>".join([
-            f"• {c['contact_name']} ({c['contact_type']})"
-            for c in company_data["contacts"]
-        ])
-
-        company_url = f"/select-company/{company_id}?phone={phone_number}"
-
-        rows_html += f"""
-        <tr>
-            <td><strong>{company_data['name']}</strong></td>
-            <td style="font-size: 14px; color: #6b7280;">{contacts_list}</td>
-            <td>
-                <a href="{company_url}" class="button">Select Company →</a>
-            </td>
-        </tr>
-        """
+        entry["contacts"].append(result)
     
-    return f"""
-    <html>
-        <head>
-            <title>CNS4U - Select Company</title>
-            <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600&family=Lato:wght@700&display=swap" rel="stylesheet">
-            <style>
-                body {{
-                    font-family: 'Poppins', sans-serif;
-                    max-width: 1000px;
-                    margin: 0 auto;
-                    padding: 0;
-                    background-color: #f4f4f4;
-                }}
-                .header {{
-                    background: #545454;
-                    padding: 20px 40px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                .logo {{
-                    max-width: 300px;
-                    height: auto;
-                }}
-                .container {{
-                    background: white;
-                    padding: 40px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-                }}
-                h1 {{
-                    color: #333333;
-                    font-family: 'Lato', sans-serif;
-                    font-weight: 700;
-                    margin-top: 0;
-                }}
-                .phone {{
-                    font-size: 24px;
-                    font-weight: 600;
-                    color: #01aeed;
-                    margin: 20px 0;
-                }}
-                .info {{
-                    color: #58595a;
-                    margin: 20px 0;
-                    line-height: 1.6;
-                }}
-                table {{
-                    width: 100%;
-                    border-collapse: collapse;
-                    margin-top: 30px;
-                }}
-                th {{
-                    background: #f1f1f1;
-                    padding: 15px;
-                    text-align: left;
-                    font-weight: 700;
-                    font-family: 'Lato', sans-serif;
-                    color: #333333;
-                    border-bottom: 2px solid #01aeed;
-                }}
-                td {{
-                    padding: 20px 15px;
-                    border-bottom: 1px solid #e5e7eb;
-                }}
-                tr:hover {{
-                    background: #f9fafb;
-                }}
-                .button {{
-                    display: inline-block;
-                    padding: 10px 20px;
-                    background: #01aeed;
-                    color: white;
-                    text-decoration: none;
-                    border-radius: 99px;
-                    font-weight: 600;
-                    transition: all 0.3s;
-                }}
-                .button:hover {{
-                    background: #dd2b28;
-                    transform: translateY(-2px);
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <img src="/static/logo-darkbg.png" alt="CNS4U Logo" class="logo" onerror="this.style.display='none'">
-            </div>
-            <div class="container">
-                <h1>Multiple Companies Found</h1>
-                <div class="phone">{phone_number}</div>
-                <p class="info">
-                    This phone number is associated with <strong>{len(companies)} companies</strong>.
-                    Please select which client you want to open:
-                </p>
-                
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Company</th>
-                            <th>Contacts</th>
-                            <th>Action</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {rows_html}
-                    </tbody>
-                </table>
-            </div>
-        </body>
-    </html>
-    """
+    return COMPANY_SELECTION_TEMPLATE.render(
+        phone_number=escape(phone_number),
+        phone_query=Markup(quote(phone_number)),  # percent-encoded, so already HTML-safe
+        companies=list(companies.values())
+    ).encode("utf-8")
 
 
-def technician_tickets_page(member_identifier: str, name: str, tickets: List[Dict]) -> str:
-    """Generate page showing technician's assigned tickets"""
-
-    # Build ticket rows HTML
-    ticket_rows = ""
-    if tickets:
-        for ticket in tickets:
-            ticket_id = ticket.get("id", "N/A")
-            summary = ticket.get("summary", "No summary")
-            status = ticket.get("status", {}).get("name", "Unknown")
-            priority = ticket.get("priority", {}).get("name", "Normal")
-            board = ticket.get("board", {}).get("name", "Unknown")
-            company = ticket.get("company", {}).get("name", "Unknown")
-
-            # Priority badge color mapping
-            priority_color = {
-                "Priority 1 - Emergency Response": "#dc2626",
-                "Priority 2 - Quick Response": "#ea580c",
-                "Priority 3 - Normal Response": "#eab308",
-                "Priority 4 - Schedule Maintenance": "#3b82f6",
-                "Priority 5 - Next Time": "#10b981",
-                "Do Not Respond": "#9333ea"
-            }.get(priority, "#eab308")
-
-            # Status color
-            status_color = "#10b981" if "new" in status.lower() else "#58595a"
-
-            ticket_rows += f"""
-            <tr style="border-bottom: 1px solid #e5e7eb;">
-                <td style="padding: 12px; text-align: left;">
-                    <a href="https://app.nilear.com/mtx/{ticket_id}"
-                       onclick="openTicketPopup('https://app.nilear.com/mtx/{ticket_id}'); return false;"
-                       style="color: #01aeed; text-decoration: none; font-weight: 600; cursor: pointer;">
-                        #{ticket_id}
-                    </a>
-                </td>
-                <td style="padding: 12px; text-align: left;">{summary[:80]}{'...' if len(summary) > 80 else ''}</td>
-                <td style="padding: 12px; text-align: left;">{company}</td>
-                <td style="padding: 12px; text-align: center; white-space: nowrap;">
-                    <span style="background: {priority_color}; color: white; padding: 6px 12px; border-radius: 99px; font-size: 11px; font-weight: 600; display: inline-block; white-space: nowrap;">
-                        {priority}
-                    </span>
-                </td>
-                <td style="padding: 12px; text-align: center; white-space: nowrap;">
-                    <span style="background: {status_color}; color: white; padding: 6px 12px; border-radius: 99px; font-size: 11px; font-weight: 600; display: inline-block;">
-                        {status}
-                    </span>
-                </td>
-                <td style="padding: 12px; text-align: left;">{board}</td>
-            </tr>
-            """
-    else:
-        ticket_rows = """
-        <tr>
-            <td colspan="6" style="padding: 24px; text-align: center; color: #6b7280;">
-                No open tickets assigned to you
-            </td>
-        </tr>
-        """
-
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>CNS4U - {name} Tickets</title>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600&family=Lato:wght@700&display=swap" rel="stylesheet">
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-            body {{
-                font-family: 'Poppins', sans-serif;
-                background: #f4f4f4;
-                min-height: 100vh;
-                padding: 0;
-            }}
-            .logo-header {{
-                background: #545454;
-                padding: 15px 30px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            }}
-            .logo {{
-                max-width: 250px;
-                height: auto;
-            }}
-            .container {{
-                max-width: 1400px;
-                margin: 0 auto;
-                background: white;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-            }}
-            .header {{
-                background: #01aeed;
-                color: white;
-                padding: 30px;
-                border-bottom: 4px solid #dd2b28;
-            }}
-            .header h1 {{
-                font-size: 28px;
-                margin-bottom: 10px;
-                font-family: 'Lato', sans-serif;
-                font-weight: 700;
-            }}
-            .tech-info {{
-                padding: 20px 30px;
-                background: #f9fafb;
-                border-bottom: 1px solid #e5e7eb;
-            }}
-            .content {{
-                padding: 30px;
-            }}
-            .section-title {{
-                font-size: 20px;
-                font-weight: 700;
-                font-family: 'Lato', sans-serif;
-                color: #333333;
-                margin-bottom: 20px;
-                padding-bottom: 10px;
-                border-bottom: 3px solid #01aeed;
-            }}
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-                background: white;
-            }}
-            th {{
-                background: #f1f1f1;
-                padding: 12px;
-                text-align: left;
-                font-weight: 700;
-                font-family: 'Lato', sans-serif;
-                color: #333333;
-                border-bottom: 2px solid #01aeed;
-            }}
-            .actions {{
-                margin-top: 30px;
-                padding-top: 20px;
-                border-top: 1px solid #e5e7eb;
-                display: flex;
-                gap: 15px;
-                flex-wrap: wrap;
-            }}
-            .btn {{
-                padding: 12px 24px;
-                border-radius: 99px;
-                text-decoration: none;
-                font-weight: 600;
-                display: inline-block;
-                transition: all 0.3s;
-            }}
-            .btn-secondary {{
-                background: #58595a;
-                color: white;
-            }}
-            .btn-secondary:hover {{
-                background: #333333;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="logo-header">
-            <img src="/static/logo-darkbg.png" alt="CNS4U Logo" class="logo" onerror="this.style.display='none'">
-        </div>
-        <div class="container">
-            <div class="header">
-                <h1>{name}'s Assigned Tickets</h1>
-                <p>Technician ID: {member_identifier}</p>
-            </div>
+# Roughly one ticket row per chunk; Jinja on its own yields every text fragment separately
+STREAM_CHUNK_SIZE = 4096
 
-            <div class="tech-info">
-                <div style="display: flex; align-items: center; gap: 20px;">
-                    <div>
-                        <span style="font-weight: 600; color: #333333;">Open Tickets:</span>
-                        <span style="color: #58595a; font-size: 18px; font-weight: 700; margin-left: 10px;">{len(tickets)}</span>
-                    </div>
-                </div>
-            </div>
 
-            <div class="content">
-                <h2 class="section-title">Open Tickets ({len(tickets)})</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Ticket #</th>
-                            <th>Summary</th>
-                            <th>Company</th>
-                            <th style="text-align: center;">Priority</th>
-                            <th style="text-align: center;">Status</th>
-                            <th>Board</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {ticket_rows}
-                    </tbody>
-                </table>
-
-                <div class="actions">
-                    <a href="https://app.nilear.com/mtx" target="_blank" class="btn btn-secondary">
-                        Open Nilear
-                    </a>
-                    <a href="/" class="btn btn-secondary">
-                        Back to Home
-                    </a>
-                </div>
-            </div>
-        </div>
-
-        <script>
-            function openTicketPopup(url) {{
-                // Calculate centered position
-                const width = Math.min(1400, window.screen.width * 0.9);
-                const height = Math.min(900, window.screen.height * 0.9);
-                const left = (window.screen.width - width) / 2;
-                const top = (window.screen.height - height) / 2;
-
-                // Open popup window with specific features
-                // This shares the browser session unlike iframe
-                const popup = window.open(
-                    url,
-                    'TicketDetails',
-                    `width=${{width}},height=${{height}},left=${{left}},top=${{top}},resizable=yes,scrollbars=yes,status=yes,toolbar=no,menubar=no,location=no`
-                );
-
-                // Focus the popup window
-                if (popup) {{
-                    popup.focus();
-                }}
-            }}
-        </script>
-    </body>
-    </html>
-    """
+def iter_technician_tickets_page(member_identifier: str, name: str, tickets: List[Dict]) -> Iterator[str]:
+    """Generate page showing technician's assigned tickets, in chunks"""
+    buffer = []
+    size = 0
+    for part in TECHNICIAN_TICKETS_TEMPLATE.generate(member_identifier=member_identifier, name=name, tickets=tickets):
+        buffer.append(part)
+        size += len(part)
+        if size >= STREAM_CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
 
 
-def unassigned_technicians_error_page(extension: str, searched_name: Optional[str], unassigned_techs: List[Dict]) -> str:
+def unassigned_technicians_error_page(extension: str, searched_name: Optional[str], unassigned_techs: List[Dict]) -> bytes:
     """Generate error page for invalid extensions showing unassigned technicians"""
+    techs = tuple(
+        (t.get('firstName', ''), t.get('lastName', ''), t.get('identifier', ''), t.get('officeEmail', ''))
+        for t in unassigned_techs
+    )
+    return _unassigned_technicians_error_page(extension, searched_name, techs)
 
-    tech_rows = ""
-    if unassigned_techs:
-        for tech in unassigned_techs:
-            first = tech.get('firstName', '')
-            last = tech.get('lastName', '')
-            identifier = tech.get('identifier', '')
-            email = tech.get('officeEmail', '')
-
-            tech_rows += f"""
-            <tr style="border-bottom: 1px solid #e5e7eb;">
-                <td style="padding: 12px;">{first} {last}</td>
-                <td style="padding: 12px;">{identifier}</td>
-                <td style="padding: 12px;">{email}</td>
-                <td style="padding: 12px; text-align: center;">
-                    <button class="assign-btn"
-                            data-extension="{extension}"
-                            data-firstname="{first}"
-                            data-lastname="{last}"
-                            data-identifier="{identifier}"
-                            onclick="assignExtension(this)">
-                        Assign Extension {extension}
-                    </button>
-                </td>
-            </tr>
-            """
-    else:
-        tech_rows = """
-        <tr>
-            <td colspan="4" style="padding: 24px; text-align: center; color: #6b7280;">
-                All technicians are already assigned to extensions
-            </td>
-        </tr>
-        """
-
-    search_info = f"Extension <strong>{extension}</strong> is not assigned"
-    if searched_name:
-        search_info += f" (searched for: {searched_name})"
-
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>CNS4U - Extension Not Found</title>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600&family=Lato:wght@700&display=swap" rel="stylesheet">
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-            body {{
-                font-family: 'Poppins', sans-serif;
-                background: #f4f4f4;
-                min-height: 100vh;
-            }}
-            .header {{
-                background: #545454;
-                padding: 20px 40px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            }}
-            .logo {{
-                max-width: 300px;
-                height: auto;
-            }}
-            .container {{
-                max-width: 900px;
-                margin: 40px auto;
-                background: white;
-                border-radius: 8px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                overflow: hidden;
-            }}
-            .error-header {{
-                background: #f59e0b;
-                color: white;
-                padding: 30px 40px;
-                border-bottom: 4px solid #d97706;
-            }}
-            .error-header h1 {{
-                font-family: 'Lato', sans-serif;
-                font-weight: 700;
-                font-size: 28px;
-                margin: 0;
-            }}
-            .content {{
-                padding: 40px;
-            }}
-            .message {{
-                color: #4b5563;
-                font-size: 18px;
-                line-height: 1.6;
-                margin-bottom: 20px;
-            }}
-            .info-box {{
-                background: #fef3c7;
-                border-left: 4px solid #f59e0b;
-                padding: 15px;
-                margin: 20px 0;
-                border-radius: 4px;
-            }}
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-                margin-top: 20px;
-                border: 1px solid #e5e7eb;
-                border-radius: 8px;
-                overflow: hidden;
-            }}
-            th {{
-                background: #f1f1f1;
-                padding: 12px;
-                text-align: left;
-                font-weight: 700;
-                font-family: 'Lato', sans-serif;
-                color: #333333;
-                border-bottom: 2px solid #01aeed;
-            }}
-            .actions {{
-                margin-top: 30px;
-                padding-top: 30px;
-                border-top: 1px solid #e5e7eb;
-            }}
-            .btn {{
-                display: inline-block;
-                padding: 12px 24px;
-                background: #01aeed;
-                color: white;
-                text-decoration: none;
-                border-radius: 99px;
-                font-weight: 600;
-                transition: all 0.3s;
-            }}
-            .btn:hover {{
-                background: #dd2b28;
-                transform: translateY(-2px);
-                box-shadow: 0 4px 12px rgba(1, 174, 237, 0.3);
-            }}
-            .assign-btn {{
-                padding: 8px 16px;
-                background: #10b981;
-                color: white;
-                border: none;
-                border-radius: 6px;
-                font-weight: 600;
-                font-size: 14px;
-                cursor: pointer;
-                transition: all 0.3s;
-            }}
-            .assign-btn:hover {{
-                background: #059669;
-                transform: translateY(-1px);
-                box-shadow: 0 2px 8px rgba(16, 185, 129, 0.3);
-            }}
-            .assign-btn:disabled {{
-                background: #9ca3af;
-                cursor: not-allowed;
-                transform: none;
-            }}
-        </style>
-        <script>
-            async function assignExtension(button) {{
-                // Get data from button attributes
-                const extension = button.dataset.extension;
-                const firstName = button.dataset.firstname;
-                const lastName = button.dataset.lastname;
-                const identifier = button.dataset.identifier || '';
-
-                // Debug logging
-                console.log('Assignment data:', {{
-                    extension: extension,
-                    firstName: firstName,
-                    lastName: lastName,
-                    identifier: identifier
-                }});
-
-                // Validation
-                if (!extension || !firstName || !lastName) {{
-                    alert('Missing required data. Please refresh and try again.');
-                    return;
-                }}
-
-                button.disabled = true;
-                button.textContent = 'Assigning...';
-
-                try {{
-                    const formData = new FormData();
-                    formData.append('extension', extension);
-                    formData.append('first_name', firstName);
-                    formData.append('last_name', lastName);
-                    if (identifier) {{
-                        formData.append('member_identifier', identifier);
-                    }}
-
-                    console.log('Sending request to /api/extensions/assign');
-
-                    const response = await fetch('/api/extensions/assign', {{
-                        method: 'POST',
-                        body: formData
-                    }});
-
-                    console.log('Response status:', response.status);
-
-                    if (response.ok) {{
-                        const result = await response.json();
-                        if (result.success) {{
-                            button.textContent = '✓ Assigned';
-                            button.style.background = '#01aeed';
-                            setTimeout(() => {{
-                                window.location.href = '/screenpop?phone=' + extension;
-                            }}, 1000);
-                        }} else {{
-                            alert('Failed to assign extension: ' + result.message);
-                            button.disabled = false;
-                            button.textContent = 'Assign Extension ' + extension;
-                        }}
-                    }} else {{
-                        const errorText = await response.text();
-                        console.error('Server error:', errorText);
-                        alert('Server error (' + response.status + '). Check console for details.');
-                        button.disabled = false;
-                        button.textContent = 'Assign Extension ' + extension;
-                    }}
-                }} catch (error) {{
-                    console.error('Error:', error);
-                    alert('Error assigning extension: ' + error.message);
-                    button.disabled = false;
-                    button.textContent = 'Assign Extension ' + extension;
-                }}
-            }}
-        </script>
-    </head>
-    <body>
-        <div class="header">
-            <img src="/static/logo-darkbg.png" alt="CNS4U Logo" class="logo" onerror="this.style.display='none'">
-        </div>
-        <div class="container">
-            <div class="error-header">
-                <h1>⚠️ Extension Not Found</h1>
-            </div>
-            <div class="content">
-                <p class="message">{search_info}</p>
-                <div class="info-box">
-                    <strong>Note:</strong> Below are technicians in ConnectWise who don't currently have an extension assigned.
-                    Contact your system administrator to assign extension {extension} to a technician.
-                </div>
 
-                <h3 style="margin-top: 30px; margin-bottom: 15px; font-family: 'Lato', sans-serif;">Unassigned Technicians</h3>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Name</th>
-                            <th>Identifier</th>
-                            <th>Email</th>
-                            <th style="text-align: center;">Action</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {tech_rows}
-                    </tbody>
-                </table>
-
-                <div class="actions">
-                    <a href="/" class="btn">← Back to Home</a>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+# Keyed on the technicians shown, so assigning one (or a member change in ConnectWise) renders afresh
+@lru_cache(maxsize=64)
+def _unassigned_technicians_error_page(extension: str, searched_name: Optional[str],
+                                       unassigned_techs: Tuple[Tuple[str, str, str, str], ...]) -> bytes:
+    # The extension repeats in every row; escaping it here lets autoescape pass it through
+    return UNASSIGNED_TECHNICIANS_TEMPLATE.render(
+        extension=escape(extension),
+        searched_name=searched_name,
+        unassigned_techs=unassigned_techs
+    ).encode("utf-8")
 
 
-def error_page(title: str, message: str, detail: str = "") -> str:
+# Output depends only on the arguments, and the same few errors repeat (e.g. a missing phone parameter)
+@lru_cache(maxsize=64)
+def error_page(title: str, message: str, detail: str = "") -> bytes:
     """Generate error page HTML with proper branding"""
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>CNS4U - {title}</title>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600&family=Lato:wght@700&display=swap" rel="stylesheet">
-        <style>
-            * {{
-                margin: 0;
-                padding: 0;
-                box-sizing: border-box;
-            }}
-            body {{
-                font-family: 'Poppins', sans-serif;
-                background: #f4f4f4;
-                min-height: 100vh;
-            }}
-            .header {{
-                background: #545454;
-                padding: 20px 40px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-            }}
-            .logo {{
-                max-width: 300px;
-                height: auto;
-            }}
-            .container {{
-                max-width: 800px;
-                margin: 40px auto;
-                background: white;
-                border-radius: 8px;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                overflow: hidden;
-            }}
-            .error-header {{
-                background: #dc2626;
-                color: white;
-                padding: 30px 40px;
-                border-bottom: 4px solid #991b1b;
-            }}
-            .error-header h1 {{
-                font-family: 'Lato', sans-serif;
-                font-weight: 700;
-                font-size: 28px;
-                margin: 0;
-            }}
-            .content {{
-                padding: 40px;
-            }}
-            .message {{
-                color: #4b5563;
-                font-size: 18px;
-                line-height: 1.6;
-                margin-bottom: 20px;
-            }}
-            .detail {{
-                color: #6b7280;
-                font-size: 14px;
-                padding: 20px;
-                background: #fef2f2;
-                border-left: 4px solid #dc2626;
-                border-radius: 4px;
-                margin-top: 20px;
-                font-family: monospace;
-            }}
-            .actions {{
-                margin-top: 30px;
-                padding-top: 30px;
-                border-top: 1px solid #e5e7eb;
-            }}
-            .btn {{
-                display: inline-block;
-                padding: 12px 24px;
-                background: #01aeed;
-                color: white;
-                text-decoration: none;
-                border-radius: 99px;
-                font-weight: 600;
-                transition: all 0.3s;
-            }}
-            .btn:hover {{
-                background: #dd2b28;
-                transform: translateY(-2px);
-                box-shadow: 0 4px 12px rgba(1, 174, 237, 0.3);
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <img src="/static/logo-darkbg.png" alt="CNS4U Logo" class="logo" onerror="this.style.display='none'">
-        </div>
-        <div class="container">
-            <div class="error-header">
-                <h1>⚠️ {title}</h1>
-            </div>
-            <div class="content">
-                <p class="message">{message}</p>
-                {f'<div class="detail"><strong>Details:</strong><br>{detail}</div>' if detail else ''}
-                <div class="actions">
-                    <a href="/" class="btn">← Back to Home</a>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    return ERROR_TEMPLATE.render(title=title, message=message, detail=detail).encode("utf-8")
 
 
 def not_found_page(phone_number: str, normalized: str) -> str:
     """Generate enhanced not found page with company search and creation"""
-    return f"""
-    <html>
-        <head>
-            <title>CNS4U - Contact Not Found</title>
-            <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@400;500;600&family=Lato:wght@700&display=swap" rel="stylesheet">
-            <style>
-                * {{
-                    margin: 0;
-                    padding: 0;
-                    box-sizing: border-box;
-                }}
-                body {{
-                    font-family: 'Poppins', sans-serif;
-                    background: #f4f4f4;
-                    min-height: 100vh;
-                }}
-                .logo-header {{
-                    background: #545454;
-                    padding: 15px 30px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                .logo {{
-                    max-width: 250px;
-                    height: auto;
-                }}
-                .container {{
-                    max-width: 900px;
-                    margin: 0 auto;
-                    background: white;
-                    padding: 40px;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-                }}
-                h1 {{
-                    color: #dd2b28;
-                    font-family: 'Lato', sans-serif;
-                    margin-top: 0;
-                    font-size: 28px;
-                }}
-                .phone {{
-                    font-size: 24px;
-                    font-weight: bold;
-                    color: #01aeed;
-                    margin: 20px 0;
-                }}
-                .section {{
-                    margin: 30px 0;
-                    padding: 20px;
-                    background: #f9fafb;
-                    border-radius: 8px;
-                    border-left: 4px solid #01aeed;
-                }}
-                .section h2 {{
-                    margin-top: 0;
-                    color: #333333;
-                    font-size: 18px;
-                    font-family: 'Lato', sans-serif;
-                    font-weight: 700;
-                }}
-                input, select {{
-                    width: 100%;
-                    padding: 10px;
-                    margin: 10px 0;
-                    border: 1px solid #d1d5db;
-                    border-radius: 6px;
-                    font-size: 14px;
-                    box-sizing: border-box;
-                    font-family: 'Poppins', sans-serif;
-                }}
-                input:focus, select:focus {{
-                    outline: none;
-                    border-color: #01aeed;
-                    box-shadow: 0 0 0 3px rgba(1, 174, 237, 0.1);
-                }}
-                button {{
-                    padding: 12px 24px;
-                    background: #01aeed;
-                    color: white;
-                    border: none;
-                    border-radius: 99px;
-                    font-size: 14px;
-                    font-weight: 600;
-                    cursor: pointer;
-                    margin: 5px;
-                    transition: all 0.3s;
-                    font-family: 'Poppins', sans-serif;
-                }}
-                button:hover {{
-                    background: #dd2b28;
-                    transform: translateY(-2px);
-                    box-shadow: 0 4px 12px rgba(1, 174, 237, 0.3);
-                }}
-                button.secondary {{
-                    background: #58595a;
-                }}
-                button.secondary:hover {{
-                    background: #333333;
-                }}
-                .hidden {{
-                    display: none;
-                }}
-                .autocomplete-results {{
-                    position: absolute;
-                    width: 100%;
-                    max-height: 200px;
-                    overflow-y: auto;
-                    background: white;
-                    border: 1px solid #d1d5db;
-                    border-top: none;
-                    border-radius: 0 0 6px 6px;
-                    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-                    z-index: 1000;
-                }}
-                .autocomplete-item {{
-                    padding: 10px;
-                    cursor: pointer;
-                    border-bottom: 1px solid #f3f4f6;
-                }}
-                .autocomplete-item:hover {{
-                    background: #f3f4f6;
-                }}
-                .autocomplete-container {{
-                    position: relative;
-                }}
-                .contact-list {{
-                    margin-top: 20px;
-                }}
-                .contact-item {{
-                    padding: 15px;
-                    background: white;
-                    border: 1px solid #e5e7eb;
-                    border-radius: 6px;
-                    margin: 10px 0;
-                    display: flex;
-                    justify-content: space-between;
-                    align-items: center;
-                }}
-                .loading {{
-                    text-align: center;
-                    color: #6b7280;
-                    padding: 20px;
-                }}
-                .form-grid {{
-                    display: grid;
-                    grid-template-columns: 1fr 1fr;
-                    gap: 15px;
-                }}
-                .form-group {{
-                    margin: 10px 0;
-                }}
-                .form-group label {{
-                    display: block;
-                    margin-bottom: 5px;
-                    color: #374151;
-                    font-weight: 500;
-                    font-size: 14px;
-                }}
-                .success {{
-                    padding: 15px;
-                    background: #10b981;
-                    color: white;
-                    border-radius: 6px;
-                    margin: 20px 0;
-                }}
-                .error {{
-                    padding: 15px;
-                    background: #dd2b28;
-                    color: white;
-                    border-radius: 6px;
-                    margin: 20px 0;
-                }}
-                a {{
-                    color: #01aeed;
-                    text-decoration: none;
-                    font-weight: 500;
-                }}
-                a:hover {{
-                    color: #dd2b28;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="logo-header">
-                <img src="/static/logo-darkbg.png" alt="CNS4U Logo" class="logo" onerror="this.style.display='none'">
-            </div>
-            <div class="container">
-                <h1>🔍 Contact Not Found</h1>
-                <div class="phone">{phone_number}</div>
-                <p style="color: #6b7280;">Normalized: <code>{normalized}</code></p>
-                
-                <div id="message"></div>
-                
-                <!-- Step 1: Search for existing company -->
-                <div class="section" id="search-section">
-                    <h2>Search for Existing Company</h2>
-                    <p>Start typing to search for a company...</p>
-                    <div class="autocomplete-container">
-                        <input 
-                            type="text" 
-                            id="company-search" 
-                            placeholder="Type company name..."
-                            autocomplete="off"
-                        />
-                        <div id="autocomplete-results" class="autocomplete-results hidden"></div>
-                    </div>
-                    <button onclick="showNewCompanyForm()">Or Create New Company</button>
-                </div>
-                
-                <!-- Step 2: Select contact or create new -->
-                <div class="section hidden" id="contact-section">
-                    <h2>Select Contact or Create New</h2>
-                    <p>Company: <strong id="selected-company-name"></strong></p>
-                    <input type="hidden" id="selected-company-id" />
-                    
-                    <div id="contact-list" class="contact-list">
-                        <div class="loading">Loading contacts...</div>
-                    </div>
-                    
-                    <button onclick="showNewContactForm()">Create New Contact</button>
-                    <button class="secondary" onclick="backToSearch()">Back to Search</button>
-                </div>
-                
-                <!-- Form: Add to existing contact -->
-                <div class="section hidden" id="add-phone-section">
-                    <h2>Add Phone to Contact</h2>
-                    <p>Contact: <strong id="contact-name"></strong></p>
-                    <input type="hidden" id="contact-id" />
-                    
-                    <form id="add-phone-form">
-                        <div class="form-group">
-                            <label>Phone Number</label>
-                            <input type="text" name="phone" value="{phone_number}" readonly />
-                        </div>
-                        <div class="form-group">
-                            <label>Phone Type</label>
-                            <select name="phone_type">
-                                <option value="Cell">Cell</option>
-                                <option value="Direct">Direct</option>
-                                <option value="Mobile">Mobile</option>
-                                <option value="Phone">Phone</option>
-                                <option value="Fax">Fax</option>
-                            </select>
-                        </div>
-                        <button type="submit">Add Phone Number</button>
-                        <button type="button" class="secondary" onclick="backToContacts()">Back</button>
-                    </form>
-                </div>
-                
-                <!-- Form: Create new contact -->
-                <div class="section hidden" id="new-contact-section">
-                    <h2>Create New Contact</h2>
-                    <p>Company: <strong id="new-contact-company-name"></strong></p>
-                    
-                    <form id="new-contact-form">
-                        <input type="hidden" id="new-contact-company-id" />
-                        <div class="form-grid">
-                            <div class="form-group">
-                                <label>First Name *</label>
-                                <input type="text" name="first_name" required />
-                            </div>
-                            <div class="form-group">
-                                <label>Last Name *</label>
-                                <input type="text" name="last_name" required />
-                            </div>
-                        </div>
-                        <div class="form-group">
-                            <label>Phone Number *</label>
-                            <input type="text" name="phone" value="{phone_number}" readonly />
-                        </div>
-                        <div class="form-group">
-                            <label>Email</label>
-                            <input type="email" name="email" />
-                        </div>
-                        <div class="form-group">
-                            <label>Phone Type</label>
-                            <select name="phone_type">
-                                <option value="Cell">Cell</option>
-                                <option value="Direct">Direct</option>
-                                <option value="Mobile">Mobile</option>
-                                <option value="Phone">Phone</option>
-                            </select>
-                        </div>
-                        <button type="submit">Create Contact</button>
-                        <button type="button" class="secondary" onclick="backToContacts()">Back</button>
-                    </form>
-                </div>
-                
-                <!-- Form: Create new company -->
-                <div class="section hidden" id="new-company-section">
-                    <h2>Create New Company</h2>
-                    
-                    <form id="new-company-form">
-                        <div class="form-group">
-                            <label>Company Name *</label>
-                            <input type="text" name="name" required />
-                        </div>
-                        <div class="form-group">
-                            <label>Address *</label>
-                            <input type="text" name="address" required />
-                        </div>
-                        <div class="form-group">
-                            <label>Address 2</label>
-                            <input type="text" name="address2" />
-                        </div>
-                        <div class="form-grid">
-                            <div class="form-group">
-                                <label>City *</label>
-                                <input type="text" name="city" required />
-                            </div>
-                            <div class="form-group">
-                                <label>State *</label>
-                                <input type="text" name="state" required maxlength="2" placeholder="CA" />
-                            </div>
-                        </div>
-                        <div class="form-grid">
-                            <div class="form-group">
-                                <label>ZIP Code *</label>
-                                <input type="text" name="zip_code" required />
-                            </div>
-                            <div class="form-group">
-                                <label>Company Phone *</label>
-                                <input type="text" name="company_phone" required />
-                            </div>
-                        </div>
-                        <div class="form-group">
-                            <label>Territory</label>
-                            <input type="text" name="territory" value="Main" />
-                        </div>
-                        
-                        <h3 style="margin-top: 30px;">Primary Contact</h3>
-                        <div class="form-grid">
-                            <div class="form-group">
-                                <label>First Name *</label>
-                                <input type="text" name="first_name" required />
-                            </div>
-                            <div class="form-group">
-                                <label>Last Name *</label>
-                                <input type="text" name="last_name" required />
-                            </div>
-                        </div>
-                        <div class="form-group">
-                            <label>Email *</label>
-                            <input type="email" name="email" required />
-                        </div>
-                        <div class="form-group">
-                            <label>Phone Number *</label>
-                            <input type="text" name="phone" value="{phone_number}" readonly />
-                        </div>
-                        
-                        <button type="submit">Create Company & Contact</button>
-                        <button type="button" class="secondary" onclick="backToSearch()">Back</button>
-                    </form>
-                </div>
-                
-                <div style="margin-top: 30px; padding-top: 20px; border-top: 1px solid #e5e7eb;">
-                    <a href="/sync?force=true">
-                        Sync Cache Now
-                    </a> |
-                    <a href="https://app.nilear.com/mtx" target="_blank">
-                        Open Nilear
-                    </a> |
-                    <a href="/">
-                        Home
-                    </a>
-                </div>
-            </div>
-            
-            <script>
-                let selectedCompany = null;
-                let debounceTimer = null;
-                
-                // Company search autocomplete
-                document.getElementById('company-search').addEventListener('input', function(e) {{
-                    clearTimeout(debounceTimer);
-                    const query = e.target.value;
-                    
-                    if (query.length < 2) {{
-                        document.getElementById('autocomplete-results').classList.add('hidden');
-                        return;
-                    }}
-                    
-                    debounceTimer = setTimeout(async () => {{
-                        const response = await fetch(`/api/companies/search?q=${{encodeURIComponent(query)}}`);
-                        const companies = await response.json();
-                        
-                        const resultsDiv = document.getElementById('autocomplete-results');
-                        resultsDiv.innerHTML = '';
-                        
-                        if (companies.length === 0) {{
-                            resultsDiv.innerHTML = '<div class="autocomplete-item">No companies found</div>';
-                        }} else {{
-                            companies.forEach(company => {{
-                                const div = document.createElement('div');
-                                div.className = 'autocomplete-item';
-                                div.textContent = company.label;
-                                div.onclick = () => selectCompany(company);
-                                resultsDiv.appendChild(div);
-                            }});
-                        }}
-                        
-                        resultsDiv.classList.remove('hidden');
-                    }}, 300);
-                }});
-                
-                async function selectCompany(company) {{
-                    selectedCompany = company;
-                    document.getElementById('autocomplete-results').classList.add('hidden');
-                    document.getElementById('company-search').value = company.name;
-                    
-                    // Show contact section
-                    document.getElementById('search-section').classList.add('hidden');
-                    document.getElementById('contact-section').classList.remove('hidden');
-                    document.getElementById('selected-company-name').textContent = company.name;
-                    document.getElementById('selected-company-id').value = company.id;
-                    
-                    // Load contacts
-                    const response = await fetch(`/api/companies/${{company.id}}/contacts`);
-                    const contacts = await response.json();
-                    
-                    const contactList = document.getElementById('contact-list');
-                    contactList.innerHTML = '';
-                    
-                    if (contacts.length === 0) {{
-                        contactList.innerHTML = '<p style="color: #6b7280;">No contacts found. Create a new one.</p>';
-                    }} else {{
-                        contacts.forEach(contact => {{
-                            const div = document.createElement('div');
-                            div.className = 'contact-item';
-                            div.innerHTML = `
-                                <div>
-                                    <strong>${{contact.name}}</strong><br>
-                                    <small style="color: #6b7280;">${{contact.phones.join(', ') || 'No phones'}}</small>
-                                </div>
-                                <button onclick="selectContact(${{contact.id}}, '${{contact.name}}')">
-                                    Add Phone to This Contact
-                                </button>
-                            `;
-                            contactList.appendChild(div);
-                        }});
-                    }}
-                }}
-                
-                function selectContact(contactId, contactName) {{
-                    document.getElementById('contact-section').classList.add('hidden');
-                    document.getElementById('add-phone-section').classList.remove('hidden');
-                    document.getElementById('contact-name').textContent = contactName;
-                    document.getElementById('contact-id').value = contactId;
-                }}
-                
-                function showNewContactForm() {{
-                    document.getElementById('contact-section').classList.add('hidden');
-                    document.getElementById('new-contact-section').classList.remove('hidden');
-                    document.getElementById('new-contact-company-name').textContent = selectedCompany.name;
-                    document.getElementById('new-contact-company-id').value = selectedCompany.id;
-                }}
-                
-                function showNewCompanyForm() {{
-                    document.getElementById('search-section').classList.add('hidden');
-                    document.getElementById('new-company-section').classList.remove('hidden');
-                }}
-                
-                function backToSearch() {{
-                    document.querySelectorAll('.section').forEach(s => s.classList.add('hidden'));
-                    document.getElementById('search-section').classList.remove('hidden');
-                }}
-                
-                function backToContacts() {{
-                    document.querySelectorAll('.section').forEach(s => s.classList.add('hidden'));
-                    document.getElementById('contact-section').classList.remove('hidden');
-                }}
-                
-                function showMessage(message, isError = false) {{
-                    const messageDiv = document.getElementById('message');
-                    messageDiv.className = isError ? 'error' : 'success';
-                    messageDiv.textContent = message;
-                    messageDiv.style.display = 'block';
-                    
-                    setTimeout(() => {{
-                        messageDiv.style.display = 'none';
-                    }}, 5000);
-                }}
-                
-                // Form submissions
-                document.getElementById('add-phone-form').addEventListener('submit', async (e) => {{
-                    e.preventDefault();
-                    const formData = new FormData(e.target);
-                    formData.append('phone', '{phone_number}');
-                    
-                    const contactId = document.getElementById('contact-id').value;
-                    const response = await fetch(`/api/contacts/${{contactId}}/add-phone`, {{
-                        method: 'POST',
-                        body: formData
-                    }});
-                    
-                    const result = await response.json();
-                    
-                    if (result.success) {{
-                        showMessage('Phone number added successfully! Redirecting...');
-                        setTimeout(() => {{
-                            window.location.href = '/company/' + selectedCompany.id;
-                        }}, 2000);
-                    }} else {{
-                        showMessage(result.message, true);
-                    }}
-                }});
-                
-                document.getElementById('new-contact-form').addEventListener('submit', async (e) => {{
-                    e.preventDefault();
-                    const formData = new FormData(e.target);
-                    formData.append('company_id', document.getElementById('new-contact-company-id').value);
-                    formData.append('phone', '{phone_number}');
-                    
-                    const response = await fetch('/api/contacts/create', {{
-                        method: 'POST',
-                        body: formData
-                    }});
-                    
-                    const result = await response.json();
-                    
-                    if (result.success) {{
-                        showMessage('Contact created successfully! Redirecting...');
-                        setTimeout(() => {{
-                            window.location.href = '/company/' + selectedCompany.id;
-                        }}, 2000);
-                    }} else {{
-                        showMessage(result.message, true);
-                    }}
-                }});
-                
-                document.getElementById('new-company-form').addEventListener('submit', async (e) => {{
-                    e.preventDefault();
-                    const formData = new FormData(e.target);
-                    formData.append('phone', '{phone_number}');
-                    
-                    const response = await fetch('/api/companies/create', {{
-                        method: 'POST',
-                        body: formData
-                    }});
-                    
-                    const result = await response.json();
-                    
-                    if (result.success) {{
-                        showMessage('Company and contact created successfully! Redirecting...');
-                        setTimeout(() => {{
-                            window.location.href = '/company/' + result.company_id;
-                        }}, 2000);
-                    }} else {{
-                        showMessage(result.message, true);
-                    }}
-                }});
-            </script>
-        </body>
-    </html>
-    """
+    return NOT_FOUND_TEMPLATE.render(phone_number=phone_number, normalized=normalized)
+
+
+# Unknown callers tend to ring back, so keep the encoded page and its gzip body for repeat numbers
+@lru_cache(maxsize=256)
+def _not_found_bodies(phone_number: str, normalized: str) -> Tuple[bytes, bytes]:
+    body = not_found_page(phone_number, normalized).encode("utf-8")
+    return body, gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def not_found_response(request: Request, phone_number: str, normalized: str) -> Response:
+    """404 not-found page, sent pre-compressed when the client accepts gzip"""
+    body, gzipped = _not_found_bodies(phone_number, normalized)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        # GZipMiddleware passes responses that already carry Content-Encoding through untouched
+        return Response(
+            content=gzipped,
+            status_code=404,
+            media_type="text/html",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+        )
+    return Response(content=body, status_code=404, media_type="text/html")
+
+
+# Printed once at startup by the __main__ block below
+STARTUP_BANNER = """
+{rule}
+🚀 8x8 Nilear Screenpop Server v2.1
+{rule}
+Server starting on port {port}
+ConnectWise: {cw}
+Nilear: {nilear}
+Cache: SQLite (data/phone_cache.db)
+Auto-sync: Every {sync_h} hours
+
+New Features:
+  • Company search with autocomplete
+  • Add phone to existing contacts
+  • Create new contacts
+  • Create new companies
+  • Auto-activate in finance module
+
+Endpoints:
+  Home:   http://localhost:{port}/
+  Health: http://localhost:{port}/health
+  Pop:    http://localhost:{port}/screenpop?phone=4084511400
+{rule}
+"""
 
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 3000))
     
-    print(f"\n{'='*60}")
-    print(f"🚀 8x8 Nilear Screenpop Server v2.1")
-    print(f"{'='*60}")
-    print(f"Server starting on port {port}")
-    print(f"ConnectWise: {CW_BASE_URL}")
-    print(f"Nilear: {NILEAR_BASE_URL}")
-    print(f"Cache: SQLite (data/phone_cache.db)")
-    print(f"Auto-sync: Every {SYNC_INTERVAL_HOURS} hours")
-    print(f"\nNew Features:")
-    print(f"  • Company search with autocomplete")
-    print(f"  • Add phone to existing contacts")
-    print(f"  • Create new contacts")
-    print(f"  • Create new companies")
-    print(f"  • Auto-activate in finance module")
-    print(f"\nEndpoints:")
-    print(f"  Home:   http://localhost:{port}/")
-    print(f"  Health: http://localhost:{port}/health")
-    print(f"  Pop:    http://localhost:{port}/screenpop?phone=4084511400")
-    print(f"{'='*60}\n")
+    # One write instead of a print per line
+    print(STARTUP_BANNER.format(
+        rule="=" * 60,
+        port=port,
+        cw=CW_BASE_URL,
+        nilear=NILEAR_BASE_URL,
+        sync_h=SYNC_INTERVAL_HOURS
+    ))
     
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Browsers only speak HTTP/2 over TLS, so h2 needs a certificate and the optional hypercorn server
+    ssl_certfile = os.getenv("SSL_CERTFILE")
+    ssl_keyfile = os.getenv("SSL_KEYFILE")
+    if ssl_certfile and ssl_keyfile:
+        try:
+            from hypercorn.asyncio import serve
+            from hypercorn.config import Config
+        except ImportError:
+            print("hypercorn not installed; serving HTTPS over HTTP/1.1 with uvicorn")
+        else:
+            config = Config()
+            config.bind = [f"0.0.0.0:{port}"]
+            config.certfile = ssl_certfile
+            config.keyfile = ssl_keyfile
+            config.alpn_protocols = ["h2", "http/1.1"]
+            asyncio.run(serve(app, config))
+            raise SystemExit
+
+    # uvicorn[standard] provides uvloop and httptools; "auto" uses them where available
+    # and falls back to asyncio/h11 (e.g. on Windows, where uvloop isn't supported).
+    # A single worker on purpose: the lookup caches and sync coordination are per-process.
+    uvicorn.run(
+        app, host="0.0.0.0", port=port, loop="auto", http="auto",
+        ssl_certfile=ssl_certfile, ssl_keyfile=ssl_keyfile
+    )
@@ -0,0 +1,270 @@
+let selectedCompany = null;
+let debounceTimer = null;
+let searchController = null;
+let searchResults = new Map();
+
+// Build DOM off the typing path when the browser supports it
+const whenIdle = window.requestIdleCallback
+    ? (fn) => requestIdleCallback(fn, { timeout: 100 })
+    : (fn) => setTimeout(fn, 0);
+
+function renderCompanyResults(companies) {
+    const resultsDiv = document.getElementById('autocomplete-results');
+    const items = document.createDocumentFragment();
+    searchResults = new Map();
+
+    if (companies.length === 0) {
+        const div = document.createElement('div');
+        div.className = 'autocomplete-item';
+        div.textContent = 'No companies found';
+        items.appendChild(div);
+    } else {
+        companies.forEach(company => {
+            const div = document.createElement('div');
+            div.className = 'autocomplete-item';
+            div.textContent = company.label;
+            div.dataset.id = company.id;
+            searchResults.set(String(company.id), company);
+            items.appendChild(div);
+        });
+    }
+
+    resultsDiv.replaceChildren(items);
+    resultsDiv.classList.remove('hidden');
+}
+
+// One listener for every result row, rather than a closure per row
+document.getElementById('autocomplete-results').addEventListener('click', function(e) {
+    const item = e.target.closest('.autocomplete-item');
+    const company = item && searchResults.get(item.dataset.id);
+    if (company) {
+        selectCompany(company);
+    }
+});
+
+// Company search autocomplete
+document.getElementById('company-search').addEventListener('input', function(e) {
+    clearTimeout(debounceTimer);
+    // Results for an older query are no longer wanted
+    if (searchController) {
+        searchController.abort();
+        searchController = null;
+    }
+    const query = e.target.value;
+
+    if (query.length < 2) {
+        document.getElementById('autocomplete-results').classList.add('hidden');
+        return;
+    }
+
+    debounceTimer = setTimeout(async () => {
+        const controller = searchController = new AbortController();
+        let companies;
+        try {
+            const response = await fetch(`/api/companies/search?q=${encodeURIComponent(query)}`, {
+                signal: controller.signal
+            });
+            companies = await response.json();
+        } catch (error) {
+            if (error.name === 'AbortError') {
+                return;
+            }
+            throw error;
+        }
+
+        whenIdle(() => {
+            if (!controller.signal.aborted) {
+                renderCompanyResults(companies);
+            }
+        });
+    }, 300);
+});
+
+// Long enough to read the success message; the company page is prefetched meanwhile
+const REDIRECT_DELAY_MS = 500;
+
+// Warm the company page (and the server's copy of its ConnectWise data) before we navigate there
+function prefetchCompany(id) {
+    const link = document.createElement('link');
+    link.rel = 'prefetch';
+    link.href = '/company/' + id;
+    document.head.appendChild(link);
+}
+
+async function selectCompany(company) {
+    selectedCompany = company;
+    prefetchCompany(company.id);
+    document.getElementById('autocomplete-results').classList.add('hidden');
+    document.getElementById('company-search').value = company.name;
+
+    // Show contact section
+    document.getElementById('search-section').classList.add('hidden');
+    document.getElementById('contact-section').classList.remove('hidden');
+    document.getElementById('selected-company-name').textContent = company.name;
+    document.getElementById('selected-company-id').value = company.id;
+
+    // Load contacts, showing each one as its line of the NDJSON stream arrives
+    const contactList = document.getElementById('contact-list');
+    const response = await fetch(`/api/companies/${company.id}/contacts`, {
+        headers: { 'Accept': 'application/x-ndjson' }
+    });
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffered = '';
+    let shown = 0;
+    let cleared = false;
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffered += value;
+        const lines = buffered.split('\n');
+        buffered = lines.pop();
+        if (!cleared) {
+            contactList.innerHTML = '';
+            cleared = true;
+        }
+        const items = document.createDocumentFragment();
+        for (const line of lines) {
+            if (line) {
+                items.appendChild(contactItem(JSON.parse(line)));
+                shown++;
+            }
+        }
+        contactList.appendChild(items);
+    }
+
+    if (shown === 0) {
+        contactList.innerHTML = '<p style="color: #6b7280;">No contacts found. Create a new one.</p>';
+    }
+}
+
+function contactItem(contact) {
+    const div = document.createElement('div');
+    div.className = 'contact-item';
+    div.innerHTML = `
+        <div>
+            <strong>${contact.name}</strong><br>
+            <small style="color: #6b7280;">${contact.phones.join(', ') || 'No phones'}</small>
+        </div>
+        <button onclick="selectContact(${contact.id}, '${contact.name}')">
+            Add Phone to This Contact
+        </button>
+    `;
+    return div;
+}
+
+function selectContact(contactId, contactName) {
+    document.getElementById('contact-section').classList.add('hidden');
+    document.getElementById('add-phone-section').classList.remove('hidden');
+    document.getElementById('contact-name').textContent = contactName;
+    document.getElementById('contact-id').value = contactId;
+}
+
+function showNewContactForm() {
+    document.getElementById('contact-section').classList.add('hidden');
+    document.getElementById('new-contact-section').classList.remove('hidden');
+    document.getElementById('new-contact-company-name').textContent = selectedCompany.name;
+    document.getElementById('new-contact-company-id').value = selectedCompany.id;
+}
+
+function showNewCompanyForm() {
+    document.getElementById('search-section').classList.add('hidden');
+    document.getElementById('new-company-section').classList.remove('hidden');
+}
+
+function backToSearch() {
+    document.querySelectorAll('.section').forEach(s => s.classList.add('hidden'));
+    document.getElementById('search-section').classList.remove('hidden');
+}
+
+function backToContacts() {
+    document.querySelectorAll('.section').forEach(s => s.classList.add('hidden'));
+    document.getElementById('contact-section').classList.remove('hidden');
+}
+
+function showMessage(message, isError = false) {
+    const messageDiv = document.getElementById('message');
+    messageDiv.className = isError ? 'error' : 'success';
+    messageDiv.textContent = message;
+    messageDiv.style.display = 'block';
+
+    setTimeout(() => {
+        messageDiv.style.display = 'none';
+    }, 5000);
+}
+
+// Form fields as a JSON body; blank fields are left out so the server's defaults apply
+function formJson(form, extra) {
+    const data = Object.fromEntries([...new FormData(form)].filter(([, value]) => value !== ''));
+    return JSON.stringify(Object.assign(data, extra));
+}
+
+const JSON_HEADERS = { 'Content-Type': 'application/json' };
+
+// Form submissions
+document.getElementById('add-phone-form').addEventListener('submit', async (e) => {
+    e.preventDefault();
+    const contactId = document.getElementById('contact-id').value;
+    const response = await fetch(`/api/contacts/${contactId}/add-phone`, {
+        method: 'POST',
+        headers: JSON_HEADERS,
+        body: formJson(e.target, { phone: PHONE_NUMBER })
+    });
+
+    const result = await response.json();
+
+    if (result.success) {
+        showMessage('Phone number added successfully! Redirecting...');
+        prefetchCompany(selectedCompany.id);
+        setTimeout(() => {
+            window.location.href = '/company/' + selectedCompany.id;
+        }, REDIRECT_DELAY_MS);
+    } else {
+        showMessage(result.message, true);
+    }
+});
+
+document.getElementById('new-contact-form').addEventListener('submit', async (e) => {
+    e.preventDefault();
+    const response = await fetch('/api/contacts/create', {
+        method: 'POST',
+        headers: JSON_HEADERS,
+        body: formJson(e.target, {
+            company_id: document.getElementById('new-contact-company-id').value,
+            phone: PHONE_NUMBER
+        })
+    });
+
+    const result = await response.json();
+
+    if (result.success) {
+        showMessage('Contact created successfully! Redirecting...');
+        prefetchCompany(selectedCompany.id);
+        setTimeout(() => {
+            window.location.href = '/company/' + selectedCompany.id;
+        }, REDIRECT_DELAY_MS);
+    } else {
+        showMessage(result.message, true);
+    }
+});
+
+document.getElementById('new-company-form').addEventListener('submit', async (e) => {
+    e.preventDefault();
+    const response = await fetch('/api/companies/create', {
+        method: 'POST',
+        headers: JSON_HEADERS,
+        body: formJson(e.target, { phone: PHONE_NUMBER })
+    });
+
+    const result = await response.json();
+
+    if (result.success) {
+        showMessage('Company and contact created successfully! Redirecting...');
+        prefetchCompany(result.company_id);
+        setTimeout(() => {
+            window.location.href = '/company/' + result.company_id;
+        }, REDIRECT_DELAY_MS);
+    } else {
+        showMessage(result.message, true);
+    }
+});
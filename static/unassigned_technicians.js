@@ -0,0 +1,71 @@
+async function assignExtension(button) {
+    // Get data from button attributes
+    const extension = button.dataset.extension;
+    const firstName = button.dataset.firstname;
+    const lastName = button.dataset.lastname;
+    const identifier = button.dataset.identifier || '';
+
+    // Debug logging
+    console.log('Assignment data:', {
+        extension: extension,
+        firstName: firstName,
+        lastName: lastName,
+        identifier: identifier
+    });
+
+    // Validation
+    if (!extension || !firstName || !lastName) {
+        alert('Missing required data. Please refresh and try again.');
+        return;
+    }
+
+    button.disabled = true;
+    button.textContent = 'Assigning...';
+
+    try {
+        const payload = {
+            extension: extension,
+            first_name: firstName,
+            last_name: lastName
+        };
+        if (identifier) {
+            payload.member_identifier = identifier;
+        }
+
+        console.log('Sending request to /api/extensions/assign');
+
+        const response = await fetch('/api/extensions/assign', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(payload)
+        });
+
+        console.log('Response status:', response.status);
+
+        if (response.ok) {
+            const result = await response.json();
+            if (result.success) {
+                button.textContent = '✓ Assigned';
+                button.style.background = '#01aeed';
+                setTimeout(() => {
+                    window.location.href = '/screenpop?phone=' + extension;
+                }, 1000);
+            } else {
+                alert('Failed to assign extension: ' + result.message);
+                button.disabled = false;
+                button.textContent = 'Assign Extension ' + extension;
+            }
+        } else {
+            const errorText = await response.text();
+            console.error('Server error:', errorText);
+            alert('Server error (' + response.status + '). Check console for details.');
+            button.disabled = false;
+            button.textContent = 'Assign Extension ' + extension;
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        alert('Error assigning extension: ' + error.message);
+        button.disabled = false;
+        button.textContent = 'Assign Extension ' + extension;
+    }
+}
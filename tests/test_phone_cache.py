@@ -0,0 +1,56 @@
+"""
+Phone cache writes for caller IDs that can't be cached
+Run with: python -m pytest tests
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import PhoneCache  # noqa: E402
+
+
+def test_add_or_update_skips_caller_id_without_digits(tmp_path):
+    cache = PhoneCache(str(tmp_path / "phone_cache.db"))
+    try:
+        # "Anonymous" normalizes to "", which can't be looked up; it is skipped, not raised
+        cache.add_or_update("Anonymous", "", 3, "Acme", 7, "Ann Onymous", "Cell")
+        cache.add_or_update("(408) 555-1212", "4085551212", 3, "Acme", 8, "Bob Smith", "Cell")
+        cache.flush()
+
+        assert cache.lookup("") == []
+        assert [hit.contact_id for hit in cache.lookup("4085551212")] == [8]
+    finally:
+        cache.close()
+
+
+def test_create_contact_succeeds_for_caller_id_without_digits(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ("CW_CLIENT_ID", "CW_PUBLIC_API_KEY", "CW_PRIVATE_API_KEY", "CW_COMPANY_ID"):
+        monkeypatch.setenv(name, "test")
+    monkeypatch.setenv("CW_BASE_URL", "https://connectwise.invalid/v4_6_release/apis/3.0")
+    server = importlib.import_module("server")
+
+    async def create_contact_with_phone(**kwargs):
+        return 77
+
+    async def get_company_by_id(company_id):
+        return {"id": company_id, "name": "Acme"}
+
+    monkeypatch.setattr(server, "create_contact_with_phone", create_contact_with_phone)
+    monkeypatch.setattr(server, "get_company_by_id", get_company_by_id)
+
+    # No lifespan: the test doesn't want the startup sync
+    response = TestClient(server.app).post("/api/contacts/create", json={
+        "company_id": 3,
+        "first_name": "Ann",
+        "last_name": "Onymous",
+        "phone": "Anonymous"
+    })
+
+    assert response.status_code == 200
+    assert response.json()["success"] is True